@@ -1,12 +1,45 @@
+from functools import partial
+
 import streamlit as st
 import pandas as pd
 from algorithms.fcfs import fcfs
 from algorithms.hrrn import hrrn
-from algorithms.srt import srt
+from algorithms.srt import SRTSimulation
 from algorithms.spn import spn
 from algorithms.rr import round_robin
-from algorithms.mfq import mlfq as mfq
-from algorithms.custom import apsa
+from algorithms.mfq import MLFQSimulation
+from algorithms.custom import APSASimulation
+from algorithms.lottery import lottery
+from algorithms.stride import stride
+from algorithms.edf import edf, deadline_report
+from algorithms.llf import llf
+from algorithms.cfs import cfs
+from algorithms.incremental import IncrementalRun
+
+DEADLINE_ALGORITHMS = ["EDF", "EDF (Non-Preemptive)", "LLF"]
+
+
+def incremental(policy, *param_names):
+    """
+    Wraps a resumable simulation in an algorithm function that keeps its last
+    run in the session, so resubmitting the form after editing a few
+    processes only re-simulates from the checkpoint before the first edit.
+    """
+
+    def run(arrival_times, service_times, *params, print_results=False):
+        key = f"incremental_{policy.__name__}"
+        previous_params, previous = st.session_state.get(key, (None, None))
+        if previous is None or previous_params != params:
+            simulation = policy(
+                arrival_times, service_times, **dict(zip(param_names, params))
+            )
+            previous = IncrementalRun(simulation)
+            st.session_state[key] = (params, previous)
+        else:
+            previous.update(arrival_times, service_times)
+        return previous.results()
+
+    return run
 
 
 def run_algorithm(
@@ -17,10 +50,36 @@ def run_algorithm(
     waiting_time_factor=None,
     arrival_time_factor=None,
     time_quantum2=None,
+    tickets=None,
+    deadlines=None,
+    nice=None,
+    min_granularity=None,
+    target_latency=None,
 ):
     service_times1 = service_times.copy()
     arrival_times1 = arrival_times.copy()
-    if time_quantum and not time_quantum2:
+    if deadlines:
+        waiting_times, turnaround_times = algo_func(
+            arrival_times, service_times, deadlines, print_results=False
+        )
+    elif nice:
+        waiting_times, turnaround_times = algo_func(
+            arrival_times,
+            service_times,
+            nice,
+            min_granularity,
+            target_latency,
+            print_results=False,
+        )
+    elif tickets:
+        waiting_times, turnaround_times = algo_func(
+            arrival_times,
+            service_times,
+            tickets,
+            time_quantum,
+            print_results=False,
+        )
+    elif time_quantum and not time_quantum2:
         waiting_times, turnaround_times = algo_func(
             arrival_times, service_times, time_quantum, print_results=False
         )
@@ -54,6 +113,10 @@ def run_algorithm(
         "Waiting Time": waiting_times,
         "Turnaround Time": turnaround_times,
     }
+    if deadlines:
+        report = deadline_report(arrival_times1, turnaround_times, deadlines)
+        data["Deadline"] = deadlines
+        data["Lateness"] = report["lateness"]
     df = pd.DataFrame(data)
     st.table(df)
 
@@ -62,6 +125,10 @@ def run_algorithm(
     avg_turnaround_time = sum(turnaround_times) / len(turnaround_times)
     st.write(f"Average Waiting Time: {avg_waiting_time:.2f}")
     st.write(f"Average Turnaround Time: {avg_turnaround_time:.2f}")
+    if deadlines:
+        st.write(f"Deadline Misses: {report['misses']}")
+        st.write(f"First Miss Time: {report['first_miss_time']}")
+        st.write(f"Maximum Lateness: {report['max_lateness']}")
 
 
 def main():
@@ -70,7 +137,19 @@ def main():
     # Selection of the algorithm
     algorithm = st.selectbox(
         "Select the scheduling algorithm:",
-        ("FCFS", "Round Robin", "SPN", "SRT", "HRRN", "MFQ", "APSA"),
+        (
+            "FCFS",
+            "Round Robin",
+            "SPN",
+            "SRT",
+            "HRRN",
+            "MFQ",
+            "APSA",
+            "Lottery",
+            "Stride",
+            *DEADLINE_ALGORITHMS,
+            "CFS",
+        ),
     )
 
     # Input for processes
@@ -86,8 +165,12 @@ def main():
     form = st.form(key="processes_form")
     arrival_times = []
     service_times = []
+    tickets = [] if algorithm in ["Lottery", "Stride"] else None
+    deadlines = [] if algorithm in DEADLINE_ALGORITHMS else None
+    nice = [] if algorithm == "CFS" else None
+    extra_column = tickets is not None or deadlines is not None or nice is not None
     for i in range(num_processes):
-        cols = form.columns(2)
+        cols = form.columns(3 if extra_column else 2)
         with cols[0]:
             arrival_time = st.number_input(
                 f"Process {i+1} - Arrival Time:", min_value=0, key=f"arrival_{i}"
@@ -98,10 +181,38 @@ def main():
             )
         arrival_times.append(arrival_time)
         service_times.append(service_time)
+        if tickets is not None:
+            with cols[2]:
+                tickets.append(
+                    st.number_input(
+                        f"Process {i+1} - Tickets:",
+                        min_value=1,
+                        value=100,
+                        key=f"tickets_{i}",
+                    )
+                )
+        if deadlines is not None:
+            with cols[2]:
+                deadlines.append(
+                    st.number_input(
+                        f"Process {i+1} - Deadline:", min_value=0, key=f"deadline_{i}"
+                    )
+                )
+        if nice is not None:
+            with cols[2]:
+                nice.append(
+                    st.number_input(
+                        f"Process {i+1} - Nice:",
+                        min_value=-20,
+                        max_value=19,
+                        value=0,
+                        key=f"nice_{i}",
+                    )
+                )
 
-    # Conditional input for time quantum if Round Robin or MFQ is selected
+    # Conditional input for time quantum if a time-sliced algorithm is selected
     time_quantum = None
-    if algorithm in ["Round Robin", "MFQ"]:
+    if algorithm in ["Round Robin", "MFQ", "Lottery", "Stride"]:
         time_quantum = form.number_input(
             "Enter time quantum:", min_value=1, value=1, key="time_quantum"
         )
@@ -128,6 +239,21 @@ def main():
             value=10,
             key="arrival_time_factor",
         )
+    min_granularity = None
+    target_latency = None
+    if algorithm == "CFS":
+        min_granularity = form.number_input(
+            "Enter the minimum granularity for CFS: ",
+            min_value=0.01,
+            value=0.75,
+            key="min_granularity",
+        )
+        target_latency = form.number_input(
+            "Enter the target latency for CFS: ",
+            min_value=0.01,
+            value=6.0,
+            key="target_latency",
+        )
     submit_button = form.form_submit_button(label="Run {}".format(algorithm))
 
     if submit_button:
@@ -135,10 +261,18 @@ def main():
             "FCFS": fcfs,
             "Round Robin": round_robin,
             "SPN": spn,
-            "SRT": srt,
+            "SRT": incremental(SRTSimulation),
             "HRRN": hrrn,
-            "MFQ": mfq,
-            "APSA": apsa,
+            "MFQ": incremental(MLFQSimulation, "t1", "t2"),
+            "APSA": incremental(
+                APSASimulation, "waiting_time_factor", "arrival_time_factor"
+            ),
+            "Lottery": lottery,
+            "Stride": stride,
+            "EDF": edf,
+            "EDF (Non-Preemptive)": partial(edf, preemptive=False),
+            "LLF": llf,
+            "CFS": cfs,
         }
 
         # Call the corresponding algorithm function
@@ -150,6 +284,11 @@ def main():
             waiting_time_factor,
             arrival_time_factor,
             time_quantum2,
+            tickets,
+            deadlines,
+            nice,
+            min_granularity,
+            target_latency,
         )
 
 
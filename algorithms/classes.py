@@ -0,0 +1,463 @@
+"""
+Job Classes
+Input: A workload with many identical (arrival time, service time) jobs
+Output: Waiting times, turnaround times of each class, or of each job on request
+
+Identical jobs are coalesced into weighted classes, which FCFS, SPN, HRRN,
+SRT and Round Robin schedule directly: the jobs of a class that run back to
+back are handled as one batch, so memory and time grow with the number of
+classes and batches rather than with the number of jobs.
+"""
+
+import heapq
+import math
+
+__all__ = [
+    "JobClasses",
+    "ClassSchedule",
+    "fcfs_classes",
+    "spn_classes",
+    "hrrn_classes",
+    "srt_classes",
+    "round_robin_classes",
+]
+
+
+class JobClasses:
+    """
+    A workload of job classes, each with an arrival time, a service time and
+    the number of identical jobs in it.
+
+    The jobs of a class are numbered 0 to count - 1 and ties between jobs are
+    broken as if the workload listed the jobs of every class together, in
+    class order. `members`, if given, lists the process indices of the jobs of
+    every class, so results can be expanded back to the original processes;
+    the schedule still breaks ties in class order, not by these indices.
+    """
+
+    def __init__(self, arrival_times, service_times, counts, members=None):
+        if any(count <= 0 for count in counts):
+            raise ValueError("Every class needs at least one job.")
+        self.arrival_times = list(arrival_times)
+        self.service_times = list(service_times)
+        self.counts = list(counts)
+        self.members = members
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Coalesces a stream of (arrival time, service time) records, such as
+        `read_trace(path)`, without keeping the individual records. Classes
+        are numbered in order of their first record.
+        """
+        index = {}
+        counts = []
+        for job in records:
+            c = index.setdefault(job, len(counts))
+            if c == len(counts):
+                counts.append(0)
+            counts[c] += 1
+        return cls([a for a, _ in index], [s for _, s in index], counts)
+
+    @classmethod
+    def compress(cls, arrival_times, service_times):
+        """
+        Coalesces per-process lists. Only runs of consecutive identical
+        processes become a class, so the jobs listed in class order are the
+        processes in index order, and ties are broken as in the per-process
+        functions.
+        """
+        jobs = []
+        counts = []
+        for job in zip(arrival_times, service_times):
+            if jobs and jobs[-1] == job:
+                counts[-1] += 1
+            else:
+                jobs.append(job)
+                counts.append(1)
+        return cls([a for a, _ in jobs], [s for _, s in jobs], counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def job_count(self):
+        return sum(self.counts)
+
+    def job_pids(self):
+        """
+        Yields the process indices of the jobs of every class: its members, or
+        the positions of its jobs when the classes are listed in order.
+        """
+        offset = 0
+        for c, count in enumerate(self.counts):
+            if self.members is not None:
+                yield self.members[c]
+            else:
+                yield range(offset, offset + count)
+            offset += count
+
+    def expand(self):
+        """
+        Returns:
+            tuple: The arrival times and service times of the individual jobs.
+        """
+        n = self.job_count
+        arrival_times = [None] * n
+        service_times = [None] * n
+        for c, pids in enumerate(self.job_pids()):
+            for pid in pids:
+                arrival_times[pid] = self.arrival_times[c]
+                service_times[pid] = self.service_times[c]
+        return arrival_times, service_times
+
+
+class ClassSchedule:
+    """
+    The schedule of a JobClasses workload, kept as runs of completions: a run
+    (first job, count, first finish, step) of a class says that its jobs
+    `first job + i`, for i below count, finished at `first finish + i * step`.
+    """
+
+    def __init__(self, workload, completions):
+        self.workload = workload
+        self.completions = completions
+        self.turnaround_totals = []
+        self.waiting_totals = []
+        for c, runs in enumerate(completions):
+            arrival = workload.arrival_times[c]
+            total = 0
+            for _, count, first_finish, step in runs:
+                total += count * (first_finish - arrival)
+                total += step * (count * (count - 1) // 2)
+            self.turnaround_totals.append(total)
+            self.waiting_totals.append(
+                total - workload.counts[c] * workload.service_times[c]
+            )
+
+    @property
+    def average_waiting_time(self):
+        return sum(self.waiting_totals) / self.workload.job_count
+
+    @property
+    def average_turnaround_time(self):
+        return sum(self.turnaround_totals) / self.workload.job_count
+
+    def expand(self):
+        """
+        Returns:
+            tuple: The waiting times and turnaround times of the individual
+            jobs, in the order of `JobClasses.expand()`.
+        """
+        n = self.workload.job_count
+        waiting_times = [None] * n
+        turnaround_times = [None] * n
+        for c, pids in enumerate(self.workload.job_pids()):
+            arrival = self.workload.arrival_times[c]
+            service = self.workload.service_times[c]
+            for first, count, first_finish, step in self.completions[c]:
+                for i in range(count):
+                    turnaround = first_finish + i * step - arrival
+                    turnaround_times[pids[first + i]] = turnaround
+                    waiting_times[pids[first + i]] = turnaround - service
+        return waiting_times, turnaround_times
+
+    def print_results(self, title):
+        workload = self.workload
+        print(title)
+        print("Class\tArrival\tService\tJobs\tAvg Waiting\tAvg Turnaround")
+        for c, count in enumerate(workload.counts):
+            print(
+                f"{c + 1}\t{workload.arrival_times[c]}\t{workload.service_times[c]}\t{count}\t{self.waiting_totals[c] / count:.2f}\t\t{self.turnaround_totals[c] / count:.2f}"
+            )
+        print(f"\nAverage Waiting Time: {self.average_waiting_time:.2f}")
+        print(f"Average Turnaround Time: {self.average_turnaround_time:.2f}")
+
+
+def _arrival_order(workload):
+    return sorted(range(len(workload)), key=lambda c: workload.arrival_times[c])
+
+
+def _starts_before(time, service, horizon):
+    """
+    Returns how many jobs run back to back from `time` start before
+    `horizon`, at which the next class arrives and the policy decides again.
+    """
+    if service <= 0 or horizon == math.inf:
+        return math.inf
+    return int(-((time - horizon) // service))
+
+
+def fcfs_classes(workload, print_results=False):
+    """
+    First-Come-First-Served over job classes, served in class order like
+    `fcfs()` serves processes in index order. Every class runs as one batch.
+
+    Args:
+        workload (JobClasses): The job classes.
+        print_results (bool, optional): Whether to print the per-class results.
+
+    Returns:
+        ClassSchedule: The schedule, with per-class totals and averages.
+    """
+    completions = []
+    time = 0
+    for c, count in enumerate(workload.counts):
+        service = workload.service_times[c]
+        start = max(time, workload.arrival_times[c])
+        completions.append([(0, count, start + service, service)])
+        time = start + count * service
+
+    schedule = ClassSchedule(workload, completions)
+    if print_results:
+        schedule.print_results("First-Come-First-Served Scheduling (Job Classes)")
+    return schedule
+
+
+def _nonpreemptive(workload, select, batch):
+    """
+    Runs a non-preemptive policy over job classes. `select(ready, time)`
+    returns the ready class whose next job runs at `time`, and
+    `batch(c, ready, time, limit)` how many of its next jobs, up to `limit`,
+    the policy would select one after the other.
+    """
+    order = _arrival_order(workload)
+    completions = [[] for _ in workload.counts]
+    started = [0] * len(workload)  # jobs of each class that have run
+    ready = []
+    next_arrival = 0
+    time = 0
+
+    while next_arrival < len(order) or ready:
+        while (
+            next_arrival < len(order)
+            and workload.arrival_times[order[next_arrival]] <= time
+        ):
+            ready.append(order[next_arrival])
+            next_arrival += 1
+        if not ready:
+            # Jump over the idle gap to the next arrival
+            time = workload.arrival_times[order[next_arrival]]
+            continue
+
+        c = select(ready, time)
+        service = workload.service_times[c]
+        horizon = math.inf
+        if next_arrival < len(order):
+            horizon = workload.arrival_times[order[next_arrival]]
+        limit = min(
+            workload.counts[c] - started[c], _starts_before(time, service, horizon)
+        )
+        count = batch(c, ready, time, limit)
+        completions[c].append((started[c], count, time + service, service))
+        started[c] += count
+        time += count * service
+        if started[c] == workload.counts[c]:
+            ready.remove(c)
+
+    return ClassSchedule(workload, completions)
+
+
+def spn_classes(workload, print_results=False):
+    """
+    Shortest Process Next over job classes. The shortest ready class keeps
+    the CPU for its remaining jobs until the next class arrives.
+
+    Args:
+        workload (JobClasses): The job classes.
+        print_results (bool, optional): Whether to print the per-class results.
+
+    Returns:
+        ClassSchedule: The schedule, with per-class totals and averages.
+    """
+    schedule = _nonpreemptive(
+        workload,
+        lambda ready, time: min(ready, key=lambda c: (workload.service_times[c], c)),
+        lambda c, ready, time, limit: limit,
+    )
+    if print_results:
+        schedule.print_results("Shortest Process Next Scheduling (Job Classes)")
+    return schedule
+
+
+def hrrn_classes(workload, print_results=False):
+    """
+    Highest Response Ratio Next over job classes. The selected class keeps
+    the CPU until the next arrival or until another ready class, whose ratio
+    grows faster, overtakes it; the response ratios are linear in time, so
+    the jobs it runs for are found by binary search.
+
+    Args:
+        workload (JobClasses): The job classes.
+        print_results (bool, optional): Whether to print the per-class results.
+
+    Returns:
+        ClassSchedule: The schedule, with per-class totals and averages.
+    """
+    arrival_times = workload.arrival_times
+    service_times = workload.service_times
+
+    def response_ratio(c, time):
+        # Ties go to the lower class, as to the lower index in hrrn()
+        return (
+            ((time - arrival_times[c]) + service_times[c]) / service_times[c],
+            -c,
+        )
+
+    def batch(c, ready, time, limit):
+        rivals = [d for d in ready if service_times[d] < service_times[c]]
+
+        def selected(j):
+            start = time + j * service_times[c]
+            ratio = response_ratio(c, start)
+            return all(ratio > response_ratio(d, start) for d in rivals)
+
+        if not rivals or limit == 1:
+            return limit
+        # Job 0 is selected; find the last selected job
+        low, high = 0, limit - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if selected(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low + 1
+
+    schedule = _nonpreemptive(
+        workload,
+        lambda ready, time: max(ready, key=lambda c: response_ratio(c, time)),
+        batch,
+    )
+    if print_results:
+        schedule.print_results(
+            "Highest Response Ratio Next (HRRN) Scheduling Algorithm (Job Classes)"
+        )
+    return schedule
+
+
+def srt_classes(workload, print_results=False):
+    """
+    Shortest Remaining Time over job classes. Jobs that have not started are
+    kept as one heap entry per class, and only a job preempted by an arrival
+    gets an entry of its own, so the heap holds at most one entry per class
+    plus one per arrival.
+
+    Args:
+        workload (JobClasses): The job classes.
+        print_results (bool, optional): Whether to print the per-class results.
+
+    Returns:
+        ClassSchedule: The schedule, with per-class totals and averages.
+    """
+    order = _arrival_order(workload)
+    completions = [[] for _ in workload.counts]
+    # heap of (remaining time, class, first job, jobs), ties go to the lower
+    # class and job, as to the lower index in srt()
+    ready = []
+    next_arrival = 0
+    time = 0
+
+    while next_arrival < len(order) or ready:
+        while (
+            next_arrival < len(order)
+            and workload.arrival_times[order[next_arrival]] <= time
+        ):
+            c = order[next_arrival]
+            heapq.heappush(ready, (workload.service_times[c], c, 0, workload.counts[c]))
+            next_arrival += 1
+        if not ready:
+            # Jump over the idle gap to the next arrival
+            time = workload.arrival_times[order[next_arrival]]
+            continue
+
+        horizon = math.inf
+        if next_arrival < len(order):
+            horizon = workload.arrival_times[order[next_arrival]]
+        remaining, c, first, count = heapq.heappop(ready)
+
+        # The jobs of the entry run one after the other until the next arrival
+        finished = count
+        if remaining > 0 and horizon != math.inf:
+            finished = min(count, int((horizon - time) // remaining))
+        if finished:
+            completions[c].append((first, finished, time + remaining, remaining))
+            time += finished * remaining
+            first += finished
+            count -= finished
+        if count and time < horizon:
+            # The next job runs until the arrival and keeps its own entry
+            heapq.heappush(ready, (remaining - (horizon - time), c, first, 1))
+            first += 1
+            count -= 1
+            time = horizon
+        if count:
+            heapq.heappush(ready, (remaining, c, first, count))
+
+    schedule = ClassSchedule(workload, completions)
+    if print_results:
+        schedule.print_results(
+            "Shortest Remaining Time (SRT) Scheduling Algorithm (Job Classes)"
+        )
+    return schedule
+
+
+def round_robin_classes(workload, quantum, print_results=False):
+    """
+    Round Robin over job classes, cycling through the classes in class order
+    from time 0 like `round_robin()` cycles through the processes. The jobs
+    of a class receive the same slices in every round, so a round costs O(1)
+    per unfinished class.
+
+    Args:
+        workload (JobClasses): The job classes.
+        quantum (int): Time quantum for the round-robin scheduling.
+        print_results (bool, optional): Whether to print the per-class results.
+
+    Returns:
+        ClassSchedule: The schedule, with per-class totals and averages.
+    """
+    completions = [[] for _ in workload.counts]
+    remaining_times = list(workload.service_times)
+    active = []
+    for c, remaining in enumerate(remaining_times):
+        if remaining > 0:
+            active.append(c)
+        else:
+            # Jobs without service never run and keep zero times
+            arrival = workload.arrival_times[c]
+            completions[c].append((0, workload.counts[c], arrival + remaining, 0))
+    t = 0  # Current time
+
+    while active:
+        unfinished = []
+        for c in active:
+            count = workload.counts[c]
+            if remaining_times[c] > quantum:
+                t += count * quantum
+                remaining_times[c] -= quantum
+                unfinished.append(c)
+            else:
+                run = remaining_times[c]
+                completions[c].append((0, count, t + run, run))
+                t += count * run
+        active = unfinished
+
+    schedule = ClassSchedule(workload, completions)
+    if print_results:
+        schedule.print_results(f"Round Robin Scheduling (Job Classes), Quantum {quantum}")
+    return schedule
+
+
+if __name__ == "__main__":
+    # A cron fan-out of 1000 jobs at time 0 and batch shards at 5 and 12
+    workload = JobClasses([0, 5, 12], [3, 10, 1], [1000, 200, 500])
+    fcfs_classes(workload, print_results=True)
+    print()
+    spn_classes(workload, print_results=True)
+    print()
+    hrrn_classes(workload, print_results=True)
+    print()
+    srt_classes(workload, print_results=True)
+    print()
+    round_robin_classes(workload, 4, print_results=True)
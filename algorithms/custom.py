@@ -2,7 +2,123 @@
 Adaptive Priority Scheduling Algorithm (APSA)
 """
 
-__all__ = ["apsa"]
+import math
+
+from algorithms.simulation import Simulation
+
+__all__ = ["apsa", "APSASimulation"]
+
+
+class APSASimulation(Simulation):
+    """
+    Resumable APSA simulation with parameters `waiting_time_factor` and
+    `arrival_time_factor`; see `Simulation` for running, snapshotting and
+    forking.
+    """
+
+    PARAMS = ("waiting_time_factor", "arrival_time_factor")
+
+    def _init_policy(self):
+        self.queue = []
+        self.joining = []  # processes that enter the queue at the next decision
+        self.last_units = {}  # length of the last time unit of completed processes
+        # (process, start, length, remaining time at the start) of a run
+        # paused by `run(until)`
+        self.paused = None
+
+    def _admit(self, pid):
+        self.joining.append(pid)
+
+    def _policy_state(self):
+        return tuple(self.queue), tuple(sorted(self.joining)), self.paused
+
+    def graft(self, graft):
+        super().graft(graft)
+        graft.first(self.last_units, graft.converged.last_units, graft.base.last_units)
+
+    def _priority(self, i):
+        # Boost priority for processes that have been waiting too long
+        waiting_boost = max(
+            (self.time - self.arrival_times[i]) * self.waiting_time_factor, 1
+        )
+        return (
+            1
+            / (
+                self.remaining_times[i]
+                + self.arrival_times[i] / self.arrival_time_factor
+            )
+            + waiting_boost
+        )
+
+    def _advance(self, until):
+        self._admit_arrivals()
+        next_arrival = self._horizon(None)
+        horizon = next_arrival if until is None else min(next_arrival, until)
+
+        # A run paused by `run(until)` goes on as if it had not been
+        # interrupted, unless a process arrived at the pause
+        paused = self.paused
+        self.paused = None
+        if paused is not None and not self.joining:
+            current_process, start, planned, remaining = paused
+        else:
+            if paused is not None:
+                self.joining.append(paused[0])
+            # Add arrived processes and the one that just ran, in index order
+            self.queue.extend(sorted(self.joining))
+            self.joining = []
+            if not self.queue:
+                # Jump over the idle gap to the next arrival
+                self.time = horizon
+                return
+
+            # Select process with highest priority
+            current_process = max(self.queue, key=self._priority)
+            self.queue.remove(current_process)
+
+            # Once its waiting boost has passed the threshold of 1, the
+            # selected process gains priority at least as fast as any waiting
+            # process, so it keeps the CPU until it completes or a new process
+            # arrives. Within the threshold it is re-evaluated after every
+            # time unit.
+            start = self.time
+            remaining = self.remaining_times[current_process]
+            planned = remaining
+            if (
+                self.queue
+                and self.waiting_time_factor > 0
+                and (self.time - self.arrival_times[current_process])
+                * self.waiting_time_factor
+                < 1
+            ):
+                planned = min(planned, 1)
+
+        if planned <= horizon - start:
+            # The end of the run and the remaining time are taken from its
+            # start, so the pieces of a paused run add up exactly
+            run = planned - (self.time - start)
+            self.remaining_times[current_process] = run + (remaining - planned)
+            self._run(current_process, run)
+            self.time = start + planned
+            self.remaining_times[current_process] = remaining - planned
+        else:
+            self._run(current_process, horizon - self.time)
+
+        # Check if the process is completed
+        if self.remaining_times[current_process] <= 0:
+            self._complete(current_process)
+            self.last_units[current_process] = planned - math.ceil(planned) + 1
+        elif self.time < start + planned and self.time < next_arrival:
+            self.paused = (current_process, start, planned, remaining)
+        else:
+            self.joining.append(current_process)
+
+    def results(self):
+        # Waiting time runs up to the start of the last time unit of service
+        result = super().results()
+        for i, last_unit in self.last_units.items():
+            result.waiting_times[i] = result.turnaround_times[i] - last_unit
+        return result
 
 
 def apsa(
@@ -15,6 +131,15 @@ def apsa(
     """
     Implements the Adaptive Priority Scheduling Algorithm (APSA).
 
+    Priorities are only compared at arrivals, completions and, while the
+    running process is still within its waiting-boost threshold, once per time
+    unit. A process leaves the threshold 1 / WAITING_TIME_FACTOR time units
+    after its arrival, so it is re-evaluated at most that many times, and the
+    cost grows with the number of processes over WAITING_TIME_FACTOR. Times
+    may be integers or floats; at a fine time scale (e.g. nanoseconds) with a
+    small factor, the unit steps dominate. Use `APSASimulation` to run part of
+    a trace and fork it.
+
     Args:
         arrival_times (list): List of arrival times for each process.
         burst_times (list): List of burst times for each process.
@@ -23,55 +148,19 @@ def apsa(
         print_results (bool, optional): Flag to print the results. Defaults to False.
 
     Returns:
-        tuple: A tuple containing the waiting times and turnaround times for each process.
+        ScheduleResult: The waiting times and turnaround times for each process,
+        which it unpacks to, with the metrics of the schedule as attributes.
     """
     num_processes = len(arrival_times)
-    waiting_times = [0] * num_processes
-    turnaround_times = [0] * num_processes
-    priorities = [1 / (burst + arrival_times[i]) for i, burst in enumerate(burst_times)]
-    completed = [False] * num_processes
-    time = 0
-    queue = []
-
-    while not all(completed):
-        # Add processes to the queue based on arrival time
-        queue.extend(
-            [
-                i
-                for i, arrival in enumerate(arrival_times)
-                if arrival <= time and not completed[i] and i not in queue
-            ]
-        )
-
-        # Recalculate priorities for waiting processes
-        for i in queue:
-            if not completed[i]:
-                waiting_times[i] = time - arrival_times[i]
-                # Boost priority for processes that have been waiting too long
-                waiting_boost = max(waiting_times[i] * WAITING_TIME_FACTOR, 1)
-                priorities[i] = (
-                    1 / (burst_times[i] + arrival_times[i] / ARRIVAL_TIME_FACTOR)
-                    + waiting_boost
-                )
-
-        # Select process with highest priority
-        if queue:
-            current_process = max(queue, key=lambda i: priorities[i])
-            queue.remove(current_process)
-
-            # Process execution simulation for one time unit
-            burst_times[current_process] -= 1
-            time += 1
-
-            # Check if the process is completed
-            if burst_times[current_process] <= 0:
-                completed[current_process] = True
-                turnaround_times[current_process] = (
-                    time - arrival_times[current_process]
-                )
+    simulation = APSASimulation(
+        arrival_times,
+        burst_times,
+        waiting_time_factor=WAITING_TIME_FACTOR,
+        arrival_time_factor=ARRIVAL_TIME_FACTOR,
+    )
+    result = simulation.run().results()
+    waiting_times, turnaround_times = result
 
-        else:
-            time += 1
     if print_results:
         print("Adaptive Priority Scheduling Algorithm (APSA):")
         print("WAITING_TIME_FACTOR:", WAITING_TIME_FACTOR)
@@ -84,7 +173,7 @@ def apsa(
         print("Average Waiting Time:", sum(waiting_times) / num_processes)
         print("Average Turnaround Time:", sum(turnaround_times) / num_processes)
 
-    return waiting_times, turnaround_times
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""
+Earliest Deadline First (EDF) Scheduling Algorithm
+"""
+
+import heapq
+
+from algorithms.result import ScheduleRecorder
+
+__all__ = ["edf", "deadline_report"]
+
+
+def deadline_report(arrival_times, turnaround_times, deadlines):
+    """
+    Summarises how well a schedule met the deadlines of its processes.
+
+    Args:
+        arrival_times (list): List of arrival times for each process.
+        turnaround_times (list): List of turnaround times for each process.
+        deadlines (list): List of absolute deadlines for each process.
+
+    Returns:
+        dict: The lateness (finish time - deadline) of every process, the
+        number of missed deadlines, the maximum lateness and the time of the
+        first miss (the earliest deadline that passed unmet, None if none).
+    """
+    lateness = [
+        arrival + turnaround - deadline
+        for arrival, turnaround, deadline in zip(
+            arrival_times, turnaround_times, deadlines
+        )
+    ]
+    missed = [deadlines[i] for i, late in enumerate(lateness) if late > 0]
+    return {
+        "lateness": lateness,
+        "misses": len(missed),
+        "max_lateness": max(lateness, default=0),
+        "first_miss_time": min(missed, default=None),
+    }
+
+
+def print_deadline_report(report):
+    print(f"Deadline Misses: {report['misses']}")
+    print(f"First Miss Time: {report['first_miss_time']}")
+    print(f"Maximum Lateness: {report['max_lateness']}")
+
+
+def edf(arrival_times, service_times, deadlines, preemptive=True, print_results=False):
+    """
+    Earliest Deadline First (EDF) Scheduling Algorithm
+
+    The ready process with the earliest deadline runs first. Ready processes
+    are kept in a heap keyed on (deadline, process) and time advances from
+    event to event, so the cost is O(n log n).
+
+    Parameters:
+    - arrival_times: List of arrival times for each process.
+    - service_times: List of service (burst) times for each process.
+    - deadlines: List of absolute deadlines for each process.
+    - preemptive: If True, an arriving process with an earlier deadline preempts the running one.
+    - print_results: Boolean, if True, print the process details and the deadline misses.
+
+    Returns:
+    - ScheduleResult: The waiting times and turnaround times for each
+      process, which it unpacks to, with the metrics of the schedule and the
+      fields of `deadline_report()` as attributes.
+    """
+    n = len(arrival_times)
+    waiting_times = [0] * n
+    finish_times = [0] * n
+    remaining_times = list(service_times)
+    recorder = ScheduleRecorder()
+    order = sorted(range(n), key=lambda i: arrival_times[i])
+    ready = []  # heap of (deadline, process)
+    time = 0
+    next_arrival = 0
+
+    while next_arrival < n or ready:
+        while next_arrival < n and arrival_times[order[next_arrival]] <= time:
+            i = order[next_arrival]
+            heapq.heappush(ready, (deadlines[i], i))
+            next_arrival += 1
+
+        if not ready:
+            # Jump over the idle gap to the next arrival
+            time = arrival_times[order[next_arrival]]
+            continue
+
+        _, earliest = heapq.heappop(ready)
+        run = remaining_times[earliest]
+        if preemptive and next_arrival < n:
+            run = min(run, arrival_times[order[next_arrival]] - time)
+        recorder.record(earliest, time, run, remaining_times[earliest] == run)
+        remaining_times[earliest] -= run
+        time += run
+
+        if remaining_times[earliest] == 0:
+            finish_times[earliest] = time
+            waiting_times[earliest] = (
+                time - arrival_times[earliest] - service_times[earliest]
+            )
+        else:
+            heapq.heappush(ready, (deadlines[earliest], earliest))
+
+    turnaround_times = [finish_times[i] - arrival_times[i] for i in range(n)]
+    report = deadline_report(arrival_times, turnaround_times, deadlines)
+
+    if print_results:
+        kind = "Preemptive" if preemptive else "Non-Preemptive"
+        print(f"Earliest Deadline First (EDF) Scheduling Algorithm ({kind})")
+        print("Process\tArrival\tService\tDeadline\tWaiting\tTurnaround")
+        for i in range(n):
+            print(
+                f"{i + 1}\t{arrival_times[i]}\t{service_times[i]}\t{deadlines[i]}\t\t{waiting_times[i]}\t{turnaround_times[i]}"
+            )
+        print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
+        print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
+        print_deadline_report(report)
+
+    return recorder.result(arrival_times, waiting_times, turnaround_times, **report)
+
+
+if __name__ == "__main__":
+    arrival_times = [0, 1, 3, 4, 7]
+    service_times = [10, 2, 5, 9, 7]
+    deadlines = [25, 5, 12, 30, 20]
+    edf(arrival_times, service_times, deadlines, print_results=True)
+    print("\n")
+    edf(arrival_times, service_times, deadlines, preemptive=False, print_results=True)
@@ -2,8 +2,34 @@
 First-Come-First-Served Scheduling Algorithm
 """
 
+from algorithms.simulation import NonPreemptiveSimulation
 
-__all__ = ["fcfs"]
+__all__ = ["fcfs", "FCFSSimulation"]
+
+
+class FCFSSimulation(NonPreemptiveSimulation):
+    """
+    Resumable FCFS simulation, serving the processes in index order; see
+    `Simulation` for running, snapshotting and forking.
+    """
+
+    def _init_policy(self):
+        super()._init_policy()
+        self.next_process = 0  # processes before it have completed
+
+    def _admit(self, pid):
+        pass
+
+    def _policy_state(self):
+        return self.next_process, self.current_process
+
+    def _select(self):
+        while self.finish_times[self.next_process] is not None:
+            self.next_process += 1
+        # Wait for the next process in line, even if later ones arrived
+        if self.arrival_times[self.next_process] > self.time:
+            return None
+        return self.next_process
 
 
 def fcfs(arrival_times, service_times, print_results=False):
@@ -12,7 +38,8 @@ def fcfs(arrival_times, service_times, print_results=False):
 
     This function implements the First-Come-First-Served (FCFS) scheduling algorithm.
     It takes a list of arrival times and service times of processes as input and returns
-    the waiting times and turnaround times of each process.
+    the waiting times and turnaround times of each process. Processes are served in
+    index order. Use `FCFSSimulation` to run part of a trace and fork it.
 
     Parameters:
     arrival_times (list): List of arrival times of processes.
@@ -20,20 +47,13 @@ def fcfs(arrival_times, service_times, print_results=False):
     print_results (bool): If True, prints the scheduling details.
 
     Returns:
-    waiting_times (list): List of waiting times of each process.
-    turnaround_times (list): List of turnaround times of each process.
+    ScheduleResult: The waiting times and turnaround times of each
+    process, which it unpacks to, with the metrics of the schedule as
+    attributes.
     """
     n = len(arrival_times)
-    waiting_times = [0] * n
-    turnaround_times = [0] * n
-    start_time = 0
-
-    for i in range(n):
-        if start_time < arrival_times[i]:
-            start_time = arrival_times[i]
-        waiting_times[i] = start_time - arrival_times[i]
-        start_time += service_times[i]
-        turnaround_times[i] = waiting_times[i] + service_times[i]
+    result = FCFSSimulation(arrival_times, service_times).run().results()
+    waiting_times, turnaround_times = result
 
     if print_results:
         print("First-Come-First-Served Scheduling")
@@ -46,7 +66,7 @@ def fcfs(arrival_times, service_times, print_results=False):
         print(f"Average Waiting Time: {sum(waiting_times)/n}")
         print(f"Average Turnaround Time: {sum(turnaround_times)/n}")
 
-    return waiting_times, turnaround_times
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""
+Fused Multi-Policy Simulation
+Input: A stream of (arrival time, service time) records and the algorithms to run
+Output: Waiting times, turnaround times of every algorithm
+
+The records are decoded once into buffers shared by all policies, and every
+policy with a resumable engine is advanced in lockstep as the stream is read,
+each with its own clock and ready structures.
+"""
+
+import itertools
+
+from algorithms.fcfs import fcfs, FCFSSimulation
+from algorithms.spn import spn, SPNSimulation
+from algorithms.srt import srt, SRTSimulation
+from algorithms.hrrn import hrrn, HRRNSimulation
+from algorithms.mfq import mlfq, MLFQSimulation
+from algorithms.custom import apsa, APSASimulation
+
+__all__ = ["run_fused", "read_trace"]
+
+# Resumable engine of an algorithm function and the names of its parameters
+ENGINES = {
+    fcfs: (FCFSSimulation, ()),
+    spn: (SPNSimulation, ()),
+    srt: (SRTSimulation, ()),
+    hrrn: (HRRNSimulation, ()),
+    mlfq: (MLFQSimulation, ("t1", "t2")),
+    apsa: (APSASimulation, ("waiting_time_factor", "arrival_time_factor")),
+}
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_trace(path):
+    """
+    Decodes a trace file with one process per line, its arrival and service
+    time separated by whitespace or a comma. Blank lines and lines starting
+    with # are skipped.
+
+    Yields:
+        tuple: The (arrival time, service time) of each process.
+    """
+    with open(path) as trace:
+        for line in trace:
+            fields = line.replace(",", " ").split()
+            if fields and not fields[0].startswith("#"):
+                yield _number(fields[0]), _number(fields[1])
+
+
+def run_fused(records, algorithms, chunk_size=4096):
+    """
+    Runs several scheduling algorithms over a single pass of a workload.
+
+    FCFS, SPN, SRT, HRRN, MLFQ and APSA are fed every chunk of records as it
+    is decoded and advanced up to its last arrival, which no later record can
+    precede. Other algorithms, such as Round Robin whose cycle spans the
+    whole workload, run on the shared buffers once the stream has ended.
+
+    Args:
+        records (iterable): (arrival time, service time) pairs in
+            nondecreasing arrival order, e.g. `zip(arrival_times,
+            service_times)` or `read_trace(path)`.
+        algorithms (dict): Maps a name to (algorithm function, extra
+            positional arguments), e.g. {"MFQ": (mlfq, (8, 16))}.
+        chunk_size (int, optional): Records decoded between two advances.
+
+    Returns:
+        dict: The (waiting times, turnaround times) of each algorithm.
+    """
+    arrival_times = []
+    service_times = []
+    order = []  # arrival order, shared by the engines
+    engines = {}
+    for name, (algo_func, params) in algorithms.items():
+        if algo_func in ENGINES:
+            policy, param_names = ENGINES[algo_func]
+            engine = policy([], [], **dict(zip(param_names, params)))
+            engine.share_workload(arrival_times, service_times, order)
+            engines[name] = engine
+
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            break
+        for arrival_time, service_time in chunk:
+            if arrival_times and arrival_time < arrival_times[-1]:
+                raise ValueError("Arrival times must be nondecreasing.")
+            order.append(len(arrival_times))
+            arrival_times.append(arrival_time)
+            service_times.append(service_time)
+        for engine in engines.values():
+            engine.sync()
+            engine.run(arrival_times[-1])
+
+    results = {}
+    for name, (algo_func, params) in algorithms.items():
+        if name in engines:
+            results[name] = engines[name].run().results()
+        else:
+            results[name] = algo_func(arrival_times, service_times, *params)
+    return results
+
+
+if __name__ == "__main__":
+    from algorithms.rr import round_robin
+
+    arrival_times = [0, 1, 3, 4, 7]
+    service_times = [10, 2, 5, 9, 7]
+    algorithms = {
+        "FCFS": (fcfs, ()),
+        "Round Robin": (round_robin, (4,)),
+        "SPN": (spn, ()),
+        "SRT": (srt, ()),
+        "HRRN": (hrrn, ()),
+        "MFQ": (mlfq, (8, 16)),
+        "APSA": (apsa, (0.5, 10)),
+    }
+    results = run_fused(zip(arrival_times, service_times), algorithms)
+    print("Algorithm\tAverage Waiting\tAverage Turnaround")
+    for name, (waiting_times, turnaround_times) in results.items():
+        print(
+            f"{name}\t\t{sum(waiting_times) / len(waiting_times):.2f}\t\t{sum(turnaround_times) / len(turnaround_times):.2f}"
+        )
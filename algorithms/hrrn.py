@@ -2,7 +2,41 @@
 Highest Response Ratio Next (HRRN) Scheduling Algorithm
 """
 
-__all__ = ["hrrn"]
+from algorithms.simulation import NonPreemptiveSimulation
+
+__all__ = ["hrrn", "HRRNSimulation"]
+
+
+class HRRNSimulation(NonPreemptiveSimulation):
+    """
+    Resumable HRRN simulation; see `Simulation` for running, snapshotting
+    and forking.
+    """
+
+    def _init_policy(self):
+        super()._init_policy()
+        self.ready = []
+
+    def _admit(self, pid):
+        self.ready.append(pid)
+
+    def _policy_state(self):
+        return tuple(sorted(self.ready)), self.current_process
+
+    def _response_ratio(self, i):
+        # Ties go to the lower index
+        return (
+            ((self.time - self.arrival_times[i]) + self.service_times[i])
+            / self.service_times[i],
+            -i,
+        )
+
+    def _select(self):
+        if not self.ready:
+            return None
+        next_process = max(self.ready, key=self._response_ratio)
+        self.ready.remove(next_process)
+        return next_process
 
 
 def hrrn(arrival_times, service_times, print_results=False):
@@ -12,6 +46,8 @@ def hrrn(arrival_times, service_times, print_results=False):
     This function implements the Highest Response Ratio Next (HRRN) scheduling algorithm.
     It schedules the processes based on their response ratio, which is calculated as the ratio
     of the sum of the waiting time and the service time to the service time.
+    Times may be integers of any magnitude (e.g. nanoseconds) or floats; idle gaps are skipped in one step.
+    Use `HRRNSimulation` to run part of a trace and fork it.
 
     Parameters:
     - arrival_times: List of arrival times for each process.
@@ -19,38 +55,16 @@ def hrrn(arrival_times, service_times, print_results=False):
     - print_results: Boolean value indicating whether to print the process details in table format.
 
     Returns:
-    - waiting_times: List of waiting times for each process.
-    - turnaround_times: List of turnaround times for each process.
+    - ScheduleResult: The waiting times and turnaround times for each
+      process, which it unpacks to, with the metrics of the schedule as
+      attributes.
     """
     n = len(arrival_times)
-    waiting_times = [0] * n
-    finish_times = [0] * n
-    start_times = [0] * n
-    remaining_times = list(service_times)
-    time = 0
-    processes = set(range(n))
-
-    while processes:
-        available_processes = [
-            (i, ((time - arrival_times[i]) + service_times[i]) / service_times[i])
-            for i in processes
-            if arrival_times[i] <= time
-        ]
-        if not available_processes:
-            time += 1
-            continue
-
-        # Process with the highest response ratio
-        next_process = max(available_processes, key=lambda x: x[1])[0]
-        processes.remove(next_process)
-        waiting_times[next_process] = time - arrival_times[next_process]
-        time += service_times[next_process]
-        finish_times[next_process] = time
-        start_times[next_process] = (
-            waiting_times[next_process] + arrival_times[next_process]
-        )
-
-    turnaround_times = [service_times[i] + waiting_times[i] for i in range(n)]
+    result = HRRNSimulation(arrival_times, service_times).run().results()
+    waiting_times, turnaround_times = result
+    start_times = [
+        arrival + waiting for arrival, waiting in zip(arrival_times, waiting_times)
+    ]
 
     if print_results:
         print("Highest Response Ratio Next (HRRN) Scheduling Algorithm")
@@ -64,7 +78,7 @@ def hrrn(arrival_times, service_times, print_results=False):
         print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
         print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
 
-    return waiting_times, turnaround_times
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+"""
+Incremental Re-Simulation
+
+Runs a resumable simulation with periodic checkpoints so an edited workload is
+re-simulated from the last checkpoint before the earliest affected time, and
+only until its schedule converges back to the previous run.
+"""
+
+import math
+
+from algorithms.simulation import Graft, changed_processes
+
+__all__ = ["IncrementalRun"]
+
+
+class IncrementalRun:
+    """
+    A simulation run that can be updated for edited workloads.
+
+    Checkpoints are snapshots taken every `interval` time units, at the same
+    times in every run, so the state of an edited run can be compared with the
+    previous run at each of them. Once both have the same future (same clock,
+    ready structures and unfinished processes), the previous run's later
+    checkpoints and final state are grafted onto the edited run, which only
+    visits the processes either run touched since the restart. An update thus
+    costs the re-simulated stretch and a few memory copies of the state
+    lists, not a pass over the whole workload.
+
+    Args:
+        simulation (Simulation): Simulation at time 0 to run, e.g.
+            `SRTSimulation(arrival_times, service_times)`.
+        interval (int, optional): Time between checkpoints. Defaults to 1/64
+            of an upper bound of the makespan, rounded up. APSA re-evaluates
+            priorities every time unit, so its interval must be a whole number.
+    """
+
+    def __init__(self, simulation, interval=None):
+        if interval is None:
+            span = max(simulation.arrival_times, default=0) + sum(
+                simulation.service_times
+            )
+            interval = max(math.ceil(span / 64), 1)
+        self.interval = interval
+        simulation.compute_digest()
+        self.checkpoints = [simulation.snapshot()]
+        self.touched = [set()]  # processes run since the previous checkpoint
+        self.final = simulation
+        self.last_update = {"restart_time": 0, "converged_time": None}
+        self._replay(simulation, 0, None, None, ())
+
+    def results(self):
+        """
+        Returns:
+            ScheduleResult: The results of the latest run, with the metrics
+            of its schedule; see `Simulation.results()`.
+        """
+        return self.final.results()
+
+    def _replay(self, simulation, index, previous, previous_touched, edited):
+        """
+        Runs `simulation` on from checkpoint `index`, replacing the later
+        checkpoints, until it completes or converges with `previous`.
+        """
+        restart = index
+        while True:
+            index += 1
+            simulation.recorder.touched = set()
+            simulation.run(index * self.interval)
+            touched = simulation.recorder.touched
+            simulation.recorder.touched = None
+            if simulation.done:
+                break
+            simulation.update_digest(self.checkpoints[index - 1], touched)
+            del self.checkpoints[index:], self.touched[index:]
+            self.touched.append(touched)
+            if previous is not None and index < len(previous):
+                # Checkpoints before an earlier restart still hold the workload
+                # of their run
+                previous[index].adopt_workload(self.final)
+            if (
+                previous is not None
+                and index < len(previous)
+                and simulation.same_future(previous[index])
+            ):
+                pids = set(edited)
+                for i in range(restart + 1, index + 1):
+                    pids |= self.touched[i]
+                    pids |= previous_touched[i]
+                graft = Graft(simulation, previous[index], pids)
+                for later in previous[index + 1 :]:
+                    later.adopt_workload(self.final)
+                    later.graft(graft)
+                self.final.graft(graft)
+                self.checkpoints.append(simulation)
+                self.checkpoints.extend(previous[index + 1 :])
+                self.touched.extend(previous_touched[index + 1 :])
+                self.last_update["converged_time"] = index * self.interval
+                return
+            self.checkpoints.append(simulation.snapshot())
+        del self.checkpoints[index:], self.touched[index:]
+        self.final = simulation
+
+    def update(self, arrival_times, service_times):
+        """
+        Re-simulates the run for an edited workload.
+
+        Returns:
+            dict: The time the re-simulation restarted from and the time it
+            converged with the previous run (None if it ran to the end).
+        """
+        old_arrivals = self.final.arrival_times
+        old_services = self.final.service_times
+        changed = changed_processes(
+            old_arrivals, old_services, arrival_times, service_times
+        )
+        old_n = len(old_arrivals)
+        n = len(arrival_times)
+        affected = [min(old_arrivals[i], arrival_times[i]) for i in changed]
+        affected.extend(old_arrivals[n:])
+        affected.extend(arrival_times[old_n:])
+        if not affected:
+            return {"restart_time": None, "converged_time": None}
+        earliest = min(affected)
+
+        # Processes that arrive at the checkpoint's time are admitted after it
+        index = 0
+        while (
+            index + 1 < len(self.checkpoints)
+            and self.checkpoints[index + 1].time < earliest
+        ):
+            index += 1
+        # Checkpoints before an earlier restart still hold the workload of
+        # their run, which differs only in processes that have not arrived
+        simulation = self.checkpoints[index].fork()
+        simulation.replace_workload(arrival_times, service_times)
+
+        previous = self.checkpoints
+        previous_touched = self.touched
+        self.checkpoints = previous[:index] + [simulation.snapshot()]
+        self.touched = previous_touched[: index + 1]
+        self.last_update = {
+            "restart_time": simulation.time,
+            "converged_time": None,
+        }
+        edited = [*changed, *range(n, old_n), *range(old_n, n)]
+        self._replay(simulation, index, previous, previous_touched, edited)
+        return self.last_update
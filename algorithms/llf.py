@@ -0,0 +1,114 @@
+"""
+Least Laxity First (LLF) Scheduling Algorithm
+"""
+
+import heapq
+
+from algorithms.edf import deadline_report, print_deadline_report
+from algorithms.result import ScheduleRecorder
+
+__all__ = ["llf"]
+
+
+def llf(arrival_times, service_times, deadlines, print_results=False):
+    """
+    Least Laxity First (LLF) Scheduling Algorithm
+
+    The ready process with the smallest laxity (deadline - time - remaining
+    time) runs first. Waiting processes all lose laxity at the same rate, so
+    they are kept in a heap keyed on (deadline - remaining time, deadline,
+    process); only the running process's key grows. It keeps the CPU until
+    its laxity reaches that of the best waiting process. Processes with equal
+    laxity would then take turns forever, so the tie goes to the earliest
+    deadline, which keeps the CPU until the next arrival or its completion,
+    as in Modified LLF. Time advances from event to event, so there are O(n)
+    events of O(log n) each, whatever the magnitude of the times.
+
+    Parameters:
+    - arrival_times: List of arrival times for each process.
+    - service_times: List of service (burst) times for each process.
+    - deadlines: List of absolute deadlines for each process.
+    - print_results: Boolean, if True, print the process details and the deadline misses.
+
+    Returns:
+    - ScheduleResult: The waiting times and turnaround times for each
+      process, which it unpacks to, with the metrics of the schedule and the
+      fields of `deadline_report()` as attributes.
+    """
+    n = len(arrival_times)
+    waiting_times = [0] * n
+    finish_times = [0] * n
+    remaining_times = list(service_times)
+    recorder = ScheduleRecorder()
+    order = sorted(range(n), key=lambda i: arrival_times[i])
+    ready = []  # heap of (deadline - remaining time, deadline, process)
+    current = None
+    tie_broken = False  # current won a laxity tie and runs to the next event
+    time = 0
+    next_arrival = 0
+
+    def key(i):
+        return deadlines[i] - remaining_times[i], deadlines[i], i
+
+    while next_arrival < n or ready or current is not None:
+        while next_arrival < n and arrival_times[order[next_arrival]] <= time:
+            i = order[next_arrival]
+            heapq.heappush(ready, key(i))
+            next_arrival += 1
+            tie_broken = False
+
+        if current is None:
+            if not ready:
+                # Jump over the idle gap to the next arrival
+                time = arrival_times[order[next_arrival]]
+                continue
+            current = heapq.heappop(ready)[2]
+        elif not tie_broken and ready and ready[0] < key(current):
+            current = heapq.heapreplace(ready, key(current))[2]
+
+        # Run until completion, the next arrival or the point where the best
+        # waiting process has the same laxity
+        run = remaining_times[current]
+        if next_arrival < n:
+            run = min(run, arrival_times[order[next_arrival]] - time)
+        if ready and not tie_broken:
+            slack = ready[0][0] - key(current)[0]
+            if slack > 0:
+                run = min(run, slack)
+            else:
+                # The laxities tie, and the earliest deadline was selected
+                tie_broken = True
+        recorder.record(current, time, run, remaining_times[current] == run)
+        remaining_times[current] -= run
+        time += run
+
+        if remaining_times[current] == 0:
+            finish_times[current] = time
+            waiting_times[current] = (
+                time - arrival_times[current] - service_times[current]
+            )
+            current = None
+            tie_broken = False
+
+    turnaround_times = [finish_times[i] - arrival_times[i] for i in range(n)]
+    report = deadline_report(arrival_times, turnaround_times, deadlines)
+
+    if print_results:
+        print("Least Laxity First (LLF) Scheduling Algorithm")
+        print("Process\tArrival\tService\tDeadline\tWaiting\tTurnaround")
+        for i in range(n):
+            print(
+                f"{i + 1}\t{arrival_times[i]}\t{service_times[i]}\t{deadlines[i]}\t\t{waiting_times[i]}\t{turnaround_times[i]}"
+            )
+        print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
+        print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
+        print_deadline_report(report)
+
+    return recorder.result(arrival_times, waiting_times, turnaround_times, **report)
+
+
+if __name__ == "__main__":
+    arrival_times = [0, 1, 3, 4, 7]
+    service_times = [10, 2, 5, 9, 7]
+    deadlines = [25, 5, 12, 30, 20]
+    llf(arrival_times, service_times, deadlines, print_results=True)
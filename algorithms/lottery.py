@@ -0,0 +1,141 @@
+"""
+Lottery Scheduling Algorithm
+"""
+
+import random
+
+from algorithms.result import ScheduleRecorder
+
+__all__ = ["lottery"]
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over the ticket counts of the processes, giving
+    O(log n) updates and O(log n) lookup of the holder of a ticket.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.step = 1 << (size.bit_length() - 1) if size else 0
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """
+        Returns the sum of the values at indices 0 to `index`.
+        """
+        total = 0
+        index += 1
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, ticket):
+        """
+        Returns the index whose ticket range contains `ticket`, i.e. the
+        smallest index whose prefix sum exceeds it.
+        """
+        position = 0
+        step = self.step
+        while step:
+            next_position = position + step
+            if next_position <= self.size and self.tree[next_position] <= ticket:
+                position = next_position
+                ticket -= self.tree[next_position]
+            step >>= 1
+        return position
+
+
+def lottery(
+    arrival_times, service_times, tickets=None, quantum=1, seed=0, print_results=False
+):
+    """
+    Lottery Scheduling Algorithm
+
+    At the start of every quantum a ticket is drawn uniformly from the tickets
+    of all ready processes and its holder runs for one quantum (or until it
+    completes). Each draw is O(log n) through a Fenwick tree over the ticket
+    counts, and idle gaps are skipped in one step.
+
+    Parameters:
+    arrival_times (list): List of arrival times of processes.
+    service_times (list): List of service (burst) times of processes.
+    tickets (list, optional): Number of tickets of each process. Defaults to 100 each.
+    quantum (int): Length of the time slice won by a draw.
+    seed (int, optional): Seed of the draws, so runs are reproducible.
+    print_results (bool): If True, prints the scheduling details.
+
+    Returns:
+    ScheduleResult: The waiting times and turnaround times for each
+    process, which it unpacks to, with the metrics of the schedule as
+    attributes.
+    """
+    n = len(arrival_times)
+    if tickets is None:
+        tickets = [100] * n
+    if any(t <= 0 for t in tickets):
+        raise ValueError("Every process needs at least one ticket.")
+    rng = random.Random(seed)
+    waiting_times = [0] * n
+    turnaround_times = [0] * n
+    remaining_times = list(service_times)
+    recorder = ScheduleRecorder()
+    order = sorted(range(n), key=lambda i: arrival_times[i])
+    pool = FenwickTree(n)
+    total_tickets = 0
+    completed = 0
+    next_arrival = 0
+    time = 0
+
+    while completed < n:
+        while next_arrival < n and arrival_times[order[next_arrival]] <= time:
+            i = order[next_arrival]
+            pool.add(i, tickets[i])
+            total_tickets += tickets[i]
+            next_arrival += 1
+
+        if not total_tickets:
+            # Jump over the idle gap to the next arrival
+            time = arrival_times[order[next_arrival]]
+            continue
+
+        winner = pool.find(rng.randrange(total_tickets))
+        run = min(quantum, remaining_times[winner])
+        recorder.record(winner, time, run, remaining_times[winner] == run)
+        remaining_times[winner] -= run
+        time += run
+
+        if remaining_times[winner] == 0:
+            pool.add(winner, -tickets[winner])
+            total_tickets -= tickets[winner]
+            completed += 1
+            turnaround_times[winner] = time - arrival_times[winner]
+            waiting_times[winner] = turnaround_times[winner] - service_times[winner]
+
+    if print_results:
+        print("Lottery Scheduling")
+        print(f"Time Quantum: {quantum}")
+        print("Process\tArrival\tService\tTickets\tWaiting\tTurnaround")
+        for i in range(n):
+            print(
+                f"{i+1}\t{arrival_times[i]}\t{service_times[i]}\t{tickets[i]}\t{waiting_times[i]}\t{turnaround_times[i]}"
+            )
+
+        print(f"Average Waiting Time: {sum(waiting_times)/n}")
+        print(f"Average Turnaround Time: {sum(turnaround_times)/n}")
+
+    return recorder.result(arrival_times, waiting_times, turnaround_times)
+
+
+if __name__ == "__main__":
+    arrival_times = [0, 1, 3, 4, 7]
+    service_times = [10, 2, 5, 9, 7]
+    tickets = [100, 50, 200, 100, 25]
+    lottery(arrival_times, service_times, tickets, quantum=2, print_results=True)
@@ -4,33 +4,147 @@ Input: Arrival times, service times, time quantum for first queue, time quantum
 Output: Waiting times, turnaround times
 """
 
-from queue import Queue
+from collections import deque
 
-__all__ = ["mlfq"]
+from algorithms.simulation import Simulation
 
+__all__ = ["mlfq", "MLFQSimulation"]
 
-class Process:
-    def __init__(self, pid, arrival_time, burst_time):
-        self.pid = pid
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.remaining_time = burst_time
-        self.waiting_time = 0
-        self.completed = False
-        self.priority = None
 
+class MLFQSimulation(Simulation):
+    """
+    Resumable MLFQ simulation with parameters `t1` and `t2`; see `Simulation`
+    for running, snapshotting and forking.
+    """
 
-def get_process_by_pid(processes, pid):
-    for process in processes:
-        if process.pid == pid:
-            return process
-    return None
+    PARAMS = ("t1", "t2")
+
+    def _set_params(self, **params):
+        old_t1 = getattr(self, "t1", None)
+        old_t2 = getattr(self, "t2", None)
+        super()._set_params(**params)
+        if hasattr(self, "time_quantum"):
+            # A fork keeps the time its counters have already used up
+            self.time_quantum[0] += self.t1 - old_t1
+            self.time_quantum[1] += self.t2 - old_t2
+
+    def _init_policy(self):
+        self.time_quantum = [self.t1, self.t2, float("inf")]
+        self.queues = [deque() for _ in range(3)]
+        self.levels = {}  # queue level of every admitted process
+        self.level_history = {}  # (time, level) changes of every admitted process
+        self.current_process = None
+
+    def _admit(self, pid):
+        self.queues[0].append(pid)
+        self.levels[pid] = 0
+        self.level_history[pid] = ((self.arrival_times[pid], 0),)
+
+    def _policy_state(self):
+        # Queued processes are at the level of their queue. A counter that
+        # has passed 0 without expiring never expires, however far it goes,
+        # and once no counter of an occupied level can expire, processes stay
+        # at their levels and the counters of the empty ones never matter.
+        current_level = self.levels.get(self.current_process)
+        occupied = [
+            bool(queue) or level == current_level
+            for level, queue in enumerate(self.queues)
+        ]
+        occupied[0] = True  # arrivals enter the first queue
+        counters = [max(quantum, 0) for quantum in self.time_quantum]
+        if not any(
+            counter > 0 for counter, used in zip(counters, occupied) if used
+        ):
+            counters = [
+                counter if used else None for counter, used in zip(counters, occupied)
+            ]
+        return (
+            tuple(map(tuple, self.queues)),
+            self.current_process,
+            current_level,
+            tuple(counters),
+        )
+
+    def graft(self, graft):
+        super().graft(graft)
+        converged = graft.converged
+        base = graft.base
+        # Unfinished processes are at the same level in both runs
+        graft.settle(self.levels, converged.levels)
+        graft.settle(self.level_history, converged.level_history)
+        for pid in graft.unfinished:
+            # Level changes since `base` follow those of `converged`
+            since = len(base.level_history.get(pid, ()))
+            history = converged.level_history.get(pid, ())
+            history += self.level_history.get(pid, ())[since:]
+            if history:
+                self.level_history[pid] = history
+
+    def snapshot(self):
+        clone = super().snapshot()
+        clone.queues = [deque(queue) for queue in self.queues]
+        return clone
+
+    def _advance(self, until):
+        self._admit_arrivals()
+
+        queues = self.queues
+        current_process = self.current_process
+        for i in range(len(queues)):
+            if queues[i] and (
+                current_process is None or i < self.levels[current_process]
+            ):
+                if current_process is not None:
+                    queues[self.levels[current_process]].append(current_process)
+                current_process = queues[i].popleft()
+                break
+        self.current_process = current_process
+
+        horizon = self._horizon(until)
+        if current_process is None:
+            # Jump over the idle gap to the next arrival
+            self.time = horizon
+            return
+
+        # Run until the process completes, its level's quantum counter runs
+        # out or the next arrival, whichever comes first. The counter only
+        # expires when it reaches exactly 0, as with per-tick decrements.
+        level = self.levels[current_process]
+        run = self.remaining_times[current_process]
+        if self.time_quantum[level] > 0:
+            run = min(run, self.time_quantum[level])
+        run = min(run, horizon - self.time)
+        self._run(current_process, run)
+        self.time_quantum[level] -= run
+
+        if self.remaining_times[current_process] == 0:
+            self._complete(current_process)
+            self.current_process = None
+        elif self.time_quantum[level] == 0:
+            if level < 2:
+                queues[level + 1].append(current_process)
+                self.levels[current_process] = level + 1
+                self.level_history[current_process] += ((self.time, level + 1),)
+            self.current_process = None
+            self.time_quantum = [8, 16, float("inf")]
+
+    def results(self):
+        result = super().results()
+        result.queue_levels = [
+            self.level_history.get(i) for i in range(len(self.arrival_times))
+        ]
+        return result
 
 
 def mlfq(arrival_times, service_times, t1, t2, print_results=False):
     """
     Implements the Multi-Level Feedback Queue (MLFQ) scheduling algorithm.
 
+    Time advances from event to event (arrivals, completions and quantum
+    expiries), so the cost only depends on the number of scheduling decisions.
+    Times may be integers of any magnitude (e.g. nanoseconds) or floats. Use
+    `MLFQSimulation` to run part of a trace and fork it.
+
     Args:
         arrival_times (list): List of arrival times for each process.
         service_times (list): List of service times for each process.
@@ -39,57 +153,12 @@ def mlfq(arrival_times, service_times, t1, t2, print_results=False):
         print_results (bool, optional): Whether to print the scheduling results. Defaults to False.
 
     Returns:
-        tuple: A tuple containing the waiting times and turnaround times for each process.
+        ScheduleResult: The waiting times and turnaround times for each process,
+        which it unpacks to, with the metrics of the schedule and queue level history as attributes.
     """
     n = len(arrival_times)
-    processes = [Process(i, arrival_times[i], service_times[i]) for i in range(n)]
-    queues = [Queue() for _ in range(3)]
-    time_quantum = [t1, t2, float("inf")]
-    current_time = 0
-    current_process = None
-    gantt_chart = []
-
-    while any(p.remaining_time > 0 for p in processes):
-        for process in processes:
-            if (
-                process.arrival_time <= current_time
-                and not process.completed
-                and process.priority is None
-            ):
-                queues[0].put(process.pid)
-                process.priority = 0
-
-        for i in range(len(queues)):
-            if not queues[i].empty() and (
-                current_process is None or i < current_process.priority
-            ):
-                if current_process:
-                    queues[current_process.priority].put(current_process.pid)
-                pid = queues[i].get()
-                current_process = get_process_by_pid(processes, pid)
-                break
-
-        if current_process:
-            current_process.remaining_time -= 1
-            time_quantum[current_process.priority] -= 1
-
-            if current_process.remaining_time == 0:
-                current_process.waiting_time = (
-                    current_time
-                    - current_process.arrival_time
-                    - current_process.burst_time
-                    + 1
-                )
-                current_process.completed = True
-                current_process = None
-            elif time_quantum[current_process.priority] == 0:
-                if current_process.priority < 2:
-                    queues[current_process.priority + 1].put(current_process.pid)
-                    current_process.priority += 1
-                current_process = None
-                time_quantum = [8, 16, float("inf")]
-
-        current_time += 1
+    result = MLFQSimulation(arrival_times, service_times, t1=t1, t2=t2).run().results()
+    waiting_times, turnaround_times = result
 
     if print_results:
         print("Multi-Level Feedback Queue Scheduling")
@@ -99,13 +168,11 @@ def mlfq(arrival_times, service_times, t1, t2, print_results=False):
         print("Process\tArrival Time\tService Time\tWaiting Time\tTurnaround Time")
         for i in range(n):
             print(
-                f"{i + 1}\t\t{arrival_times[i]}\t\t{service_times[i]}\t\t{processes[i].waiting_time}\t\t{processes[i].waiting_time + service_times[i]}"
+                f"{i + 1}\t\t{arrival_times[i]}\t\t{service_times[i]}\t\t{waiting_times[i]}\t\t{turnaround_times[i]}"
             )
-    waiting_times = [p.waiting_time for p in processes]
-    turnaround_times = [p.waiting_time + p.burst_time for p in processes]
-    print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
-    print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
-    return waiting_times, turnaround_times
+        print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
+        print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""
+Schedule Results
+
+The result of every algorithm: the waiting and turnaround times, which it
+still unpacks to, and the metrics recorded while the schedule ran.
+"""
+
+__all__ = ["ScheduleResult", "ScheduleRecorder"]
+
+
+class ScheduleResult(tuple):
+    """
+    A (waiting_times, turnaround_times) pair with the metrics of the schedule
+    as attributes:
+
+    - response_times: Time from arrival to first dispatch of each process.
+    - finish_times: Completion time of each process.
+    - preemptions: Times each process lost the CPU before completing.
+    - slices: Contiguous runs of each process on the CPU.
+    - context_switches: Times the CPU switched to a different process.
+    - busy_time: Total time the CPU ran a process.
+    - cpu_utilization: busy_time over the time from 0 to the last completion.
+    - queue_levels: For MLFQ, the (time, queue level) changes of each
+      process, otherwise None.
+
+    EDF and LLF results also carry the fields of their `deadline_report()`:
+    lateness, misses, max_lateness and first_miss_time.
+
+    Processes that did not run have None response and finish times.
+    """
+
+    def __new__(cls, waiting_times, turnaround_times, **metrics):
+        result = super().__new__(cls, (waiting_times, turnaround_times))
+        result.__dict__.update(metrics)
+        return result
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    @property
+    def waiting_times(self):
+        return self[0]
+
+    @property
+    def turnaround_times(self):
+        return self[1]
+
+
+class ScheduleRecorder:
+    """
+    Records the metrics of a schedule with O(1) work for every run of a
+    process, however the algorithm splits a slice into steps.
+    """
+
+    def __init__(self):
+        self.first_starts = {}
+        self.finish_times = {}
+        self.slices = {}
+        self.preemptions = {}
+        self.context_switches = 0
+        self.busy_time = 0
+        self.last_process = None
+        self.last_end = None
+        self.last_completed = True
+        self.touched = None  # processes whose metrics changed, while tracked
+
+    def record(self, pid, start, duration, completed):
+        """
+        Records that process `pid` ran from `start` for `duration` and
+        whether it completed.
+        """
+        if self.touched is not None:
+            self.touched.add(pid)
+        if pid != self.last_process or start != self.last_end:
+            if pid != self.last_process:
+                if self.last_process is not None:
+                    self.context_switches += 1
+                if not self.last_completed:
+                    last = self.last_process
+                    self.preemptions[last] = self.preemptions.get(last, 0) + 1
+                    if self.touched is not None:
+                        self.touched.add(last)
+            self.slices[pid] = self.slices.get(pid, 0) + 1
+            self.first_starts.setdefault(pid, start)
+        self.busy_time += duration
+        self.last_process = pid
+        self.last_end = start + duration
+        self.last_completed = completed
+        if completed:
+            self.finish_times[pid] = self.last_end
+
+    def copy(self):
+        clone = ScheduleRecorder()
+        clone.__dict__.update(self.__dict__)
+        for name in ("first_starts", "finish_times", "slices", "preemptions"):
+            setattr(clone, name, dict(getattr(self, name)))
+        clone.touched = None
+        return clone
+
+    def boundary(self, time):
+        """
+        Returns what the metrics of the next run at or after `time` depend on.
+        """
+        return self.last_process, self.last_completed, self.last_end == time
+
+    def graft(self, graft, converged, base):
+        """
+        Grafts the metrics of the recorder `converged` onto this later state
+        of the recorder `base`, see `Simulation.graft()`.
+        """
+        graft.first(self.first_starts, converged.first_starts, base.first_starts)
+        graft.first(self.finish_times, converged.finish_times, base.finish_times)
+        graft.count(self.slices, converged.slices, base.slices)
+        graft.count(self.preemptions, converged.preemptions, base.preemptions)
+        self.context_switches += converged.context_switches - base.context_switches
+        self.busy_time += converged.busy_time - base.busy_time
+
+    def result(
+        self,
+        arrival_times,
+        waiting_times,
+        turnaround_times,
+        queue_levels=None,
+        **metrics,
+    ):
+        """
+        Returns:
+            ScheduleResult: The times with the recorded metrics and any other
+            `metrics` given.
+        """
+        n = len(arrival_times)
+        first_starts = [self.first_starts.get(i) for i in range(n)]
+        makespan = max(self.finish_times.values(), default=0)
+        return ScheduleResult(
+            waiting_times,
+            turnaround_times,
+            response_times=[
+                None if start is None else start - arrival
+                for start, arrival in zip(first_starts, arrival_times)
+            ],
+            finish_times=[self.finish_times.get(i) for i in range(n)],
+            preemptions=[self.preemptions.get(i, 0) for i in range(n)],
+            slices=[self.slices.get(i, 0) for i in range(n)],
+            context_switches=self.context_switches,
+            busy_time=self.busy_time,
+            cpu_utilization=self.busy_time / makespan if makespan > 0 else 0,
+            queue_levels=queue_levels,
+            **metrics,
+        )
@@ -2,6 +2,8 @@
 Round Robin Scheduling Algorithm
 """
 
+from algorithms.result import ScheduleRecorder
+
 __all__ = ["round_robin"]
 
 
@@ -16,11 +18,13 @@ def round_robin(arrival_times, service_times, quantum, print_results=False):
     print_results (bool): If True, prints the scheduling details.
 
     Returns:
-    waiting_times (list): List of waiting times for each process.
-    turnaround_times (list): List of turnaround times for each process.
+    ScheduleResult: The waiting times and turnaround times for each
+    process, which it unpacks to, with the metrics of the schedule as
+    attributes.
     """
     n = len(arrival_times)
     remaining_times = list(service_times)
+    recorder = ScheduleRecorder()
     waiting_times = [0] * n
     turnaround_times = [0] * n
     t = 0  # Current time
@@ -31,9 +35,11 @@ def round_robin(arrival_times, service_times, quantum, print_results=False):
             if remaining_times[i] > 0:
                 done = False
                 if remaining_times[i] > quantum:
+                    recorder.record(i, t, quantum, False)
                     t += quantum
                     remaining_times[i] -= quantum
                 else:
+                    recorder.record(i, t, remaining_times[i], True)
                     t += remaining_times[i]
                     waiting_times[i] = t - service_times[i] - arrival_times[i]
                     remaining_times[i] = 0
@@ -56,7 +62,7 @@ def round_robin(arrival_times, service_times, quantum, print_results=False):
         print(f"Average Waiting Time: {sum(waiting_times)/n}")
         print(f"Average Turnaround Time: {sum(turnaround_times)/n}")
 
-    return waiting_times, turnaround_times
+    return recorder.result(arrival_times, waiting_times, turnaround_times)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,620 @@
+"""
+Resumable Scheduling Simulations
+
+Base class of the event-driven simulations that can be run up to a point in
+time, snapshotted and forked into continuations with other policies or
+parameters, so the shared prefix of a long trace is only simulated once.
+"""
+
+import bisect
+import copy
+import math
+from collections import deque
+from itertools import compress, count, repeat
+from operator import is_, ne
+
+from algorithms.result import ScheduleRecorder
+
+__all__ = ["Simulation", "NonPreemptiveSimulation", "Graft", "changed_processes"]
+
+
+def changed_processes(arrival_times, service_times, new_arrivals, new_services):
+    """
+    Returns the indices of the processes present in both workloads whose
+    arrival or service time differs, without a Python-level loop over them.
+    """
+    changed = set()
+    for old, new in ((arrival_times, new_arrivals), (service_times, new_services)):
+        if old != new:
+            changed.update(compress(count(), map(ne, old, new)))
+    return sorted(changed)
+
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(state):
+    # The splitmix64 finalizer over the hash of a process's state, so that
+    # the nearly linear tuple hashes of neighbouring states cannot cancel out
+    # in the sum
+    z = hash(state) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _digest_terms(pids, arrival_times, service_times, remaining_times):
+    return sum(map(_mix, zip(pids, arrival_times, service_times, remaining_times)))
+
+
+def _scatter(values, indices, new_values):
+    # Assigns values[indices[k]] = new_values[k] without a Python-level loop
+    deque(map(values.__setitem__, indices, new_values), maxlen=0)
+
+
+class Graft:
+    """
+    What `Simulation.graft()` changes in the later states of a run so that
+    they continue another run, computed once for all of them.
+
+    Args:
+        converged (Simulation): The other run at the time of `base`.
+        base (Simulation): The run at a time the two have the same future
+            (see `Simulation.same_future()`).
+        pids (set): Every process whose workload or history may differ
+            between `converged` and `base`: the edited ones and the ones
+            either run touched since they last agreed.
+
+    Each of these processes is either completed at the time of `base` in both
+    runs, and keeps its history from `converged`, or unfinished in the same
+    state, and its history is that of `converged` followed by what the later
+    state added since `base`. Only the latter are visited for every state;
+    the former are assigned in bulk.
+    """
+
+    def __init__(self, converged, base, pids):
+        n = len(converged.arrival_times)
+        self.converged = converged
+        self.base = base
+        self.removed = sorted(pid for pid in pids if pid >= n)
+        self.completed = []
+        self.unfinished = []
+        for pid in pids:
+            if pid < n:
+                if converged.finish_times[pid] is None:
+                    self.unfinished.append(pid)
+                else:
+                    self.completed.append(pid)
+        self.finish_times = [converged.finish_times[pid] for pid in self.completed]
+        self.remaining_times = [
+            converged.remaining_times[pid] for pid in self.completed
+        ]
+        self.settled = {}  # (updates, deletions) of every per-process map
+
+    def _settle(self, converged, default):
+        key = id(converged)
+        if key not in self.settled:
+            updates = {}
+            deletions = list(self.removed)
+            for pid in self.completed:
+                value = converged.get(pid, default)
+                if value is None:
+                    deletions.append(pid)
+                else:
+                    updates[pid] = value
+            self.settled[key] = updates, deletions
+        updates, deletions = self.settled[key]
+        return updates, deletions
+
+    def settle(self, values, converged):
+        """
+        Grafts a per-process map for the completed and removed processes
+        only, leaving the unfinished ones to the caller.
+        """
+        updates, deletions = self._settle(converged, None)
+        values.update(updates)
+        for pid in deletions:
+            values.pop(pid, None)
+
+    def first(self, values, converged, base):
+        """
+        Grafts a per-process map of values that are set once, such as the
+        first dispatch.
+        """
+        self.settle(values, converged)
+        for pid in self.unfinished:
+            if pid in converged:
+                values[pid] = converged[pid]
+            elif pid in base:
+                del values[pid]
+
+    def count(self, values, converged, base):
+        """
+        Grafts a per-process map of counts: those of `converged` plus what was
+        counted since `base`.
+        """
+        updates, deletions = self._settle(converged, 0)
+        values.update(updates)
+        for pid in deletions:
+            values.pop(pid, None)
+        for pid in self.unfinished:
+            values[pid] = converged.get(pid, 0) + values.get(pid, 0) - base.get(pid, 0)
+
+
+class Simulation:
+    """
+    State shared by all policies: the workload, the clock, the remaining and
+    finish times and the position in the arrival stream.
+
+    Subclasses set PARAMS to the names of their parameters and implement
+    `_init_policy()` (create the ready structures), `_admit(pid)` (add an
+    arrived process to them), `_advance(until)` (process the next event,
+    without passing `until`) and `_policy_state()` (a comparable value of the
+    ready structures, see `future_state()`). Processes are run through
+    `_run(pid, duration)`, which records the metrics of the schedule; the
+    per-process history a policy keeps may only change for the process it
+    runs, so `graft()` can find it.
+
+    The arrival and service times are shared copy-on-write between a
+    simulation and its snapshots; the rest of the state lives in flat lists
+    that are copied, which is O(n) pointer copies instead of re-simulating.
+    """
+
+    PARAMS = ()
+
+    def __init__(self, arrival_times, service_times, **params):
+        n = len(arrival_times)
+        self.arrival_times = list(arrival_times)
+        self.service_times = list(service_times)
+        self.order = sorted(range(n), key=lambda i: self.arrival_times[i])
+        self.owns_workload = True
+        self.remaining_times = list(service_times)
+        self.finish_times = [None] * n
+        self.next_arrival = 0
+        self.completed = 0
+        self.time = 0
+        self.digest = None  # see `compute_digest()`
+        self.recorder = ScheduleRecorder()
+        self._set_params(**params)
+        self._init_policy()
+
+    @property
+    def done(self):
+        return self.completed == len(self.arrival_times)
+
+    def _set_params(self, **params):
+        for name, value in params.items():
+            if name not in self.PARAMS:
+                raise TypeError(f"{type(self).__name__} has no parameter {name!r}")
+            setattr(self, name, value)
+
+    def _init_policy(self):
+        raise NotImplementedError
+
+    def _admit(self, pid):
+        raise NotImplementedError
+
+    def _advance(self, until):
+        raise NotImplementedError
+
+    def _policy_state(self):
+        raise NotImplementedError
+
+    def _admit_arrivals(self):
+        while (
+            self.next_arrival < len(self.order)
+            and self.arrival_times[self.order[self.next_arrival]] <= self.time
+        ):
+            self._admit(self.order[self.next_arrival])
+            self.next_arrival += 1
+
+    def _horizon(self, until):
+        """
+        Returns the time of the next arrival, capped at `until`.
+        """
+        horizon = math.inf if until is None else until
+        if self.next_arrival < len(self.order):
+            horizon = min(horizon, self.arrival_times[self.order[self.next_arrival]])
+        return horizon
+
+    def _run(self, pid, duration):
+        """
+        Runs process `pid` for `duration` from the current time.
+        """
+        self.recorder.record(
+            pid, self.time, duration, self.remaining_times[pid] == duration
+        )
+        self.remaining_times[pid] -= duration
+        self.time += duration
+
+    def _complete(self, pid):
+        self.finish_times[pid] = self.time
+        self.completed += 1
+
+    def run(self, until=None):
+        """
+        Simulates up to time `until`, or until all processes have completed.
+
+        Returns:
+            Simulation: The simulation itself, so calls can be chained.
+        """
+        while not self.done and (until is None or self.time < until):
+            self._advance(until)
+        return self
+
+    def step(self):
+        """
+        Processes the next event.
+
+        Returns:
+            Simulation: The simulation itself, so calls can be chained.
+        """
+        if not self.done:
+            self._advance(None)
+        return self
+
+    def add_process(self, arrival_time, service_time):
+        """
+        Adds a process that arrives at or after the current time.
+
+        Returns:
+            int: The index of the new process.
+        """
+        if arrival_time < self.time:
+            raise ValueError("A process cannot arrive before the current time.")
+        if not self.owns_workload:
+            self.arrival_times = list(self.arrival_times)
+            self.service_times = list(self.service_times)
+            self.order = list(self.order)
+            self.owns_workload = True
+        pid = len(self.arrival_times)
+        self.arrival_times.append(arrival_time)
+        self.service_times.append(service_time)
+        self.remaining_times.append(service_time)
+        self.finish_times.append(None)
+        if self.digest is not None:
+            self.digest += _mix((pid, arrival_time, service_time, service_time))
+        bisect.insort(
+            self.order, pid, lo=self.next_arrival, key=self.arrival_times.__getitem__
+        )
+        return pid
+
+    def share_workload(self, arrival_times, service_times, order):
+        """
+        Reads the workload from lists owned by a stream reader, which appends
+        processes in arrival order to all three and then calls `sync()`.
+        """
+        self.arrival_times = arrival_times
+        self.service_times = service_times
+        self.order = order
+        self.owns_workload = False
+        self.sync()
+
+    def sync(self):
+        """
+        Picks up the processes appended to the shared workload lists.
+        """
+        known = len(self.finish_times)
+        n = len(self.service_times)
+        self.remaining_times.extend(self.service_times[known:])
+        self.finish_times.extend([None] * (n - known))
+        if self.digest is not None:
+            self.digest += _digest_terms(
+                range(known, n),
+                self.arrival_times[known:],
+                self.service_times[known:],
+                self.service_times[known:],
+            )
+
+    def replace_workload(self, arrival_times, service_times):
+        """
+        Replaces the workload with an edited one, in which only processes that
+        have not arrived yet are changed, added or removed.
+
+        Only the edited processes are visited; the lists themselves are
+        compared and copied without a Python-level loop.
+        """
+        old_n = len(self.arrival_times)
+        n = len(arrival_times)
+        changed = changed_processes(
+            self.arrival_times, self.service_times, arrival_times, service_times
+        )
+        if not self.owns_workload:
+            self.order = list(self.order)
+        order = self.order
+        for pid in [*changed, *range(n, old_n)]:
+            try:
+                del order[order.index(pid, self.next_arrival)]
+            except ValueError:
+                raise ValueError(
+                    "Processes that have arrived cannot be edited."
+                ) from None
+            if self.digest is not None:
+                self.digest -= self._digest_term(pid)
+
+        self.arrival_times = list(arrival_times)
+        self.service_times = list(service_times)
+        self.owns_workload = True
+        del self.remaining_times[n:], self.finish_times[n:]
+        self.remaining_times.extend([None] * (n - old_n))
+        self.finish_times.extend([None] * (n - old_n))
+        for pid in [*changed, *range(old_n, n)]:
+            arrival_time = self.arrival_times[pid]
+            service_time = self.service_times[pid]
+            if arrival_time < self.time:
+                raise ValueError("A process cannot arrive before the current time.")
+            self.remaining_times[pid] = service_time
+            self.finish_times[pid] = None
+            if self.digest is not None:
+                self.digest += self._digest_term(pid)
+            bisect.insort(
+                order,
+                pid,
+                lo=self.next_arrival,
+                key=lambda pid: (self.arrival_times[pid], pid),
+            )
+
+    def adopt_workload(self, run):
+        """
+        Shares the workload of `run`, which differs from this one only in
+        processes that have not arrived yet here.
+        """
+        if (
+            self.arrival_times is not run.arrival_times
+            or self.service_times is not run.service_times
+        ):
+            self.replace_workload(run.arrival_times, run.service_times)
+            self.arrival_times = run.arrival_times
+            self.service_times = run.service_times
+            run.owns_workload = self.owns_workload = False
+
+    def graft(self, graft):
+        """
+        Turns this later state of a run into the state that another run, which
+        converged with it, reaches at the same time; see `Graft`.
+        """
+        converged = graft.converged
+        n = len(converged.arrival_times)
+        old_n = len(self.arrival_times)
+        self.arrival_times = converged.arrival_times
+        self.service_times = converged.service_times
+        converged.owns_workload = self.owns_workload = False
+        if n != old_n:
+            # Removed and added processes are completed in the admitted prefix
+            self.order = list(self.order)
+            for pid in range(n, old_n):
+                self.order.remove(pid)
+                self.next_arrival -= 1
+            for pid in range(old_n, n):
+                self.order.insert(self.next_arrival, pid)
+                self.next_arrival += 1
+            self.completed += len(range(old_n, n)) - len(range(n, old_n))
+            del self.remaining_times[n:], self.finish_times[n:]
+            self.remaining_times.extend([None] * (n - old_n))
+            self.finish_times.extend([None] * (n - old_n))
+        _scatter(self.finish_times, graft.completed, graft.finish_times)
+        _scatter(self.remaining_times, graft.completed, graft.remaining_times)
+        self.recorder.graft(graft, converged.recorder, graft.base.recorder)
+
+    def _digest_term(self, pid):
+        return _mix(
+            (
+                pid,
+                self.arrival_times[pid],
+                self.service_times[pid],
+                self.remaining_times[pid],
+            )
+        )
+
+    def compute_digest(self):
+        """
+        Sets `digest` to the sum of the mixed hashes of the (pid, arrival,
+        service, remaining) tuples of the unfinished processes, which
+        `same_future()` compares. Events do not update it, to keep them cheap; workload edits
+        do, and `update_digest()` catches up with a stretch of the run.
+        """
+        unfinished = list(compress(count(), map(is_, self.finish_times, repeat(None))))
+        self.digest = _digest_terms(
+            unfinished,
+            map(self.arrival_times.__getitem__, unfinished),
+            map(self.service_times.__getitem__, unfinished),
+            map(self.remaining_times.__getitem__, unfinished),
+        )
+
+    def update_digest(self, previous, pids):
+        """
+        Brings `digest` up to date with the run since `previous`, an earlier
+        state of it with an up-to-date digest, given the processes run since
+        then (see `ScheduleRecorder.touched`).
+        """
+        self.digest = previous.digest
+        for pid in pids:
+            if previous.finish_times[pid] is None:
+                self.digest -= previous._digest_term(pid)
+            if self.finish_times[pid] is None:
+                self.digest += self._digest_term(pid)
+
+    def future_state(self):
+        """
+        Returns the state that determines the rest of the schedule: the clock,
+        the unfinished processes and the policy's ready structures. Two runs
+        with equal future states complete the unfinished processes at the
+        same times.
+        """
+        unfinished = tuple(
+            (
+                pid,
+                self.arrival_times[pid],
+                self.service_times[pid],
+                self.remaining_times[pid],
+            )
+            for pid, finish in enumerate(self.finish_times)
+            if finish is None
+        )
+        return self.time, unfinished, self._policy_state()
+
+    def same_future(self, checkpoint):
+        """
+        Returns whether the simulation has the future state of `checkpoint`,
+        a state of another run of the policy, and would record the same
+        metrics from here on.
+
+        The unfinished processes are compared by their running digests rather
+        than one by one, so the check costs as much as comparing the ready
+        structures; equal digests of different sets are a 64-bit hash
+        collision.
+        """
+        return (
+            self.time == checkpoint.time
+            and self.digest == checkpoint.digest
+            and self.recorder.boundary(self.time)
+            == checkpoint.recorder.boundary(checkpoint.time)
+            and self._policy_state() == checkpoint._policy_state()
+        )
+
+    def snapshot(self):
+        """
+        Returns an independent copy of the simulation at its current time.
+        """
+        clone = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (list, dict)) and name not in (
+                "arrival_times",
+                "service_times",
+                "order",
+            ):
+                setattr(clone, name, copy.copy(value))
+        clone.recorder = self.recorder.copy()
+        self.owns_workload = clone.owns_workload = False
+        return clone
+
+    def fork(self, policy=None, **params):
+        """
+        Returns a continuation of the simulation from its current time.
+
+        Args:
+            policy (type, optional): Simulation subclass to continue with.
+                Defaults to the policy of this simulation.
+            **params: Parameters of the continuation's policy. Parameters that
+                are not given keep their current values for the same policy,
+                and must all be given for a different one.
+
+        The processes that have arrived but not completed are admitted to the
+        new policy's ready structures in arrival order.
+        """
+        if policy is None or policy is type(self):
+            clone = self.snapshot()
+            clone._set_params(**params)
+            return clone
+
+        missing = [name for name in policy.PARAMS if name not in params]
+        if missing:
+            raise TypeError(
+                f"{policy.__name__} needs the parameters {', '.join(map(repr, missing))}"
+            )
+        clone = policy.__new__(policy)
+        state = self.snapshot()
+        for name in (
+            "arrival_times",
+            "service_times",
+            "order",
+            "owns_workload",
+            "remaining_times",
+            "finish_times",
+            "next_arrival",
+            "completed",
+            "time",
+            "digest",
+            "recorder",
+        ):
+            setattr(clone, name, getattr(state, name))
+        clone._set_params(**params)
+        clone._init_policy()
+        for pid in self.order[: self.next_arrival]:
+            if self.finish_times[pid] is None:
+                clone._admit(pid)
+        return clone
+
+    def results(self):
+        """
+        Returns:
+            ScheduleResult: The waiting times and turnaround times of the
+            processes, None for processes that have not completed yet, with
+            the metrics of the schedule so far.
+        """
+        turnaround_times = [
+            None if finish is None else finish - arrival
+            for finish, arrival in zip(self.finish_times, self.arrival_times)
+        ]
+        waiting_times = [
+            None if turnaround is None else turnaround - service
+            for turnaround, service in zip(turnaround_times, self.service_times)
+        ]
+        return self.recorder.result(
+            self.arrival_times, waiting_times, turnaround_times
+        )
+
+
+class NonPreemptiveSimulation(Simulation):
+    """
+    Base of the policies that keep a selected process on the CPU until it
+    completes. Subclasses implement `_select()`, which removes the next
+    process to run from the ready structures and returns it, or None if no
+    process is ready.
+
+    Waiting times run up to the start of service, as in the non-preemptive
+    functions, so they do not pick up rounding from the finish times. A
+    process that was already served under another policy before a fork has
+    no start of service here, and its waiting time is taken from its finish.
+    """
+
+    def _init_policy(self):
+        self.current_process = None
+        self.start_times = {}
+
+    def _select(self):
+        raise NotImplementedError
+
+    def _advance(self, until):
+        self._admit_arrivals()
+        if self.current_process is None:
+            self.current_process = self._select()
+            if self.current_process is None:
+                # Jump over the idle gap to the next arrival
+                self.time = self._horizon(until)
+                return
+            current_process = self.current_process
+            # Service started before a fork to this policy is not a start
+            if (
+                self.remaining_times[current_process]
+                == self.service_times[current_process]
+            ):
+                self.start_times.setdefault(current_process, self.time)
+
+        # A run up to `until` only pauses the selected process
+        current_process = self.current_process
+        limit = math.inf if until is None else until
+        self._run(
+            current_process, min(self.remaining_times[current_process], limit - self.time)
+        )
+        if self.remaining_times[current_process] == 0:
+            # Completion is taken from the start of service, so that a run
+            # paused by `until` ends at the same time as an uninterrupted one
+            start = self.start_times.get(current_process)
+            if start is not None:
+                self.time = start + self.service_times[current_process]
+            self._complete(current_process)
+            self.current_process = None
+
+    def graft(self, graft):
+        super().graft(graft)
+        graft.first(
+            self.start_times, graft.converged.start_times, graft.base.start_times
+        )
+
+    def results(self):
+        result = super().results()
+        for i, start in self.start_times.items():
+            if self.finish_times[i] is not None:
+                result.waiting_times[i] = start - self.arrival_times[i]
+        return result
@@ -2,7 +2,33 @@
 Shortest Process Next (SPN) Scheduling Algorithm
 """
 
-__all__ = ["spn"]
+import heapq
+
+from algorithms.simulation import NonPreemptiveSimulation
+
+__all__ = ["spn", "SPNSimulation"]
+
+
+class SPNSimulation(NonPreemptiveSimulation):
+    """
+    Resumable SPN simulation; see `Simulation` for running, snapshotting
+    and forking.
+    """
+
+    def _init_policy(self):
+        super()._init_policy()
+        self.ready = []  # heap of (service time, process), ties go to the lower index
+
+    def _admit(self, pid):
+        heapq.heappush(self.ready, (self.service_times[pid], pid))
+
+    def _policy_state(self):
+        return tuple(sorted(self.ready)), self.current_process
+
+    def _select(self):
+        if not self.ready:
+            return None
+        return heapq.heappop(self.ready)[1]
 
 
 def spn(arrival_times, service_times, print_results=False):
@@ -11,6 +37,8 @@ def spn(arrival_times, service_times, print_results=False):
 
     This function implements the Shortest Process Next (SPN) scheduling algorithm.
     It takes a list of arrival times and service times as input and returns the waiting times and turnaround times for each process.
+    Times may be integers of any magnitude (e.g. nanoseconds) or floats; idle gaps are skipped in one step.
+    Use `SPNSimulation` to run part of a trace and fork it.
 
     Parameters:
     - arrival_times: List of arrival times for each process.
@@ -18,31 +46,13 @@ def spn(arrival_times, service_times, print_results=False):
     - print_results: Boolean value indicating whether to print the process details and summary. Default is False.
 
     Returns:
-    - waiting_times: List of waiting times for each process.
-    - turnaround_times: List of turnaround times for each process.
+    - ScheduleResult: The waiting times and turnaround times for each
+      process, which it unpacks to, with the metrics of the schedule as
+      attributes.
     """
     n = len(arrival_times)
-    waiting_times = [0] * n
-    finish_times = [0] * n
-    service_times_remaining = list(service_times)
-    time = 0
-    processes = set(range(n))
-
-    while processes:
-        available_processes = [i for i in processes if arrival_times[i] <= time]
-        if not available_processes:
-            time += 1
-            continue
-
-        shortest_process = min(
-            available_processes, key=lambda i: service_times_remaining[i]
-        )
-        processes.remove(shortest_process)
-        waiting_times[shortest_process] = time - arrival_times[shortest_process]
-        time += service_times_remaining[shortest_process]
-        finish_times[shortest_process] = time
-
-    turnaround_times = [finish_times[i] - arrival_times[i] for i in range(n)]
+    result = SPNSimulation(arrival_times, service_times).run().results()
+    waiting_times, turnaround_times = result
 
     if print_results:
         print("Shortest Process Next Scheduling")
@@ -54,7 +64,7 @@ def spn(arrival_times, service_times, print_results=False):
         print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
         print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
 
-    return waiting_times, turnaround_times
+    return result
 
 
 if __name__ == "__main__":
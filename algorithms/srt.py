@@ -2,57 +2,69 @@
 Shortest Remaining Time (SRT) Scheduling Algorithm
 """
 
-__all__ = ["srt"]
+import heapq
+
+from algorithms.simulation import Simulation
+
+__all__ = ["srt", "SRTSimulation"]
+
+
+class SRTSimulation(Simulation):
+    """
+    Resumable SRT simulation; see `Simulation` for running, snapshotting
+    and forking.
+    """
+
+    def _init_policy(self):
+        self.ready = []  # heap of (remaining time, process), ties go to the lower index
+
+    def _admit(self, pid):
+        heapq.heappush(self.ready, (self.remaining_times[pid], pid))
+
+    def _policy_state(self):
+        return tuple(sorted(self.ready))
+
+    def _advance(self, until):
+        # Only arrivals and completions can change the running process, so
+        # time jumps from one of those events to the next.
+        self._admit_arrivals()
+        horizon = self._horizon(until)
+        if not self.ready:
+            self.time = horizon
+            return
+
+        remaining, shortest = heapq.heappop(self.ready)
+        run = min(remaining, horizon - self.time)
+        self._run(shortest, run)
+
+        if self.remaining_times[shortest] == 0:
+            self._complete(shortest)
+        else:
+            heapq.heappush(self.ready, (self.remaining_times[shortest], shortest))
 
 
 def srt(arrival_times, service_times, print_results=False):
     """
     Shortest Remaining Time (SRT) Scheduling Algorithm
+
+    Time advances from event to event (arrivals and completions), so the cost
+    only depends on the number of processes. Times may be integers of any
+    magnitude (e.g. nanoseconds) or floats. Use `SRTSimulation` to run part of
+    a trace and fork it.
+
     Parameters:
     - arrival_times: List of arrival times
     - service_times: List of service (burst) times
     - print_results: Boolean, if True, print the process details in table format
 
     Returns:
-    - waiting_times: List of waiting times for each process
-    - turnaround_times: List of turnaround times for each process
+    - ScheduleResult: The waiting times and turnaround times for each
+      process, which it unpacks to, with the metrics of the schedule as
+      attributes.
     """
     n = len(arrival_times)
-    waiting_times = [0] * n
-    finish_times = [0] * n
-    remaining_times = list(service_times)
-    time = 0
-    completed = 0
-
-    while completed != n:
-        # Find process with minimum remaining time
-        shortest = min(
-            [
-                i
-                for i in range(n)
-                if arrival_times[i] <= time and remaining_times[i] > 0
-            ],
-            key=lambda x: remaining_times[x],
-            default=-1,
-        )
-
-        if shortest == -1:
-            time += 1
-            continue
-
-        remaining_times[shortest] -= 1
-        time += 1
-
-        if remaining_times[shortest] == 0:
-            completed += 1
-            finish_times[shortest] = time
-            waiting_times[shortest] = (
-                finish_times[shortest]
-                - arrival_times[shortest]
-                - service_times[shortest]
-            )
-
-    turnaround_times = [finish_times[i] - arrival_times[i] for i in range(n)]
+    result = SRTSimulation(arrival_times, service_times).run().results()
+    waiting_times, turnaround_times = result
 
     if print_results:
         print("\nShortest Remaining Time (SRT) Scheduling Algorithm")
@@ -64,7 +76,7 @@ def srt(arrival_times, service_times, print_results=False):
         print(f"\nAverage Waiting Time: {sum(waiting_times) / n:.2f}")
         print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
 
-    return waiting_times, turnaround_times
+    return result
 
 
 if __name__ == "__main__":
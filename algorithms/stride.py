@@ -0,0 +1,96 @@
+"""
+Stride Scheduling Algorithm
+"""
+
+import heapq
+
+from algorithms.result import ScheduleRecorder
+
+__all__ = ["stride"]
+
+# Large constant divided by the tickets of a process to get its stride
+STRIDE1 = 1 << 20
+
+
+def stride(arrival_times, service_times, tickets=None, quantum=1, print_results=False):
+    """
+    Stride Scheduling Algorithm
+
+    Every process has a stride inversely proportional to its tickets and a
+    pass value that advances by its stride each time it runs a quantum. The
+    ready process with the smallest pass value runs next; ready processes are
+    kept in a min-heap keyed on (pass, process), so every dispatch is O(log n).
+    A process that arrives starts one stride ahead of the pass value of the
+    last dispatched process, so it cannot monopolise the CPU.
+
+    Parameters:
+    arrival_times (list): List of arrival times of processes.
+    service_times (list): List of service (burst) times of processes.
+    tickets (list, optional): Number of tickets of each process. Defaults to 100 each.
+    quantum (int): Length of the time slice of a dispatch.
+    print_results (bool): If True, prints the scheduling details.
+
+    Returns:
+    ScheduleResult: The waiting times and turnaround times for each
+    process, which it unpacks to, with the metrics of the schedule as
+    attributes.
+    """
+    n = len(arrival_times)
+    if tickets is None:
+        tickets = [100] * n
+    if any(t <= 0 for t in tickets):
+        raise ValueError("Every process needs at least one ticket.")
+    strides = [STRIDE1 // t for t in tickets]
+    waiting_times = [0] * n
+    turnaround_times = [0] * n
+    remaining_times = list(service_times)
+    recorder = ScheduleRecorder()
+    order = sorted(range(n), key=lambda i: arrival_times[i])
+    ready = []  # heap of (pass value, process)
+    global_pass = 0
+    next_arrival = 0
+    time = 0
+
+    while next_arrival < n or ready:
+        while next_arrival < n and arrival_times[order[next_arrival]] <= time:
+            i = order[next_arrival]
+            heapq.heappush(ready, (global_pass + strides[i], i))
+            next_arrival += 1
+
+        if not ready:
+            # Jump over the idle gap to the next arrival
+            time = arrival_times[order[next_arrival]]
+            continue
+
+        global_pass, current = heapq.heappop(ready)
+        run = min(quantum, remaining_times[current])
+        recorder.record(current, time, run, remaining_times[current] == run)
+        remaining_times[current] -= run
+        time += run
+
+        if remaining_times[current] == 0:
+            turnaround_times[current] = time - arrival_times[current]
+            waiting_times[current] = turnaround_times[current] - service_times[current]
+        else:
+            heapq.heappush(ready, (global_pass + strides[current], current))
+
+    if print_results:
+        print("Stride Scheduling")
+        print(f"Time Quantum: {quantum}")
+        print("Process\tArrival\tService\tTickets\tWaiting\tTurnaround")
+        for i in range(n):
+            print(
+                f"{i+1}\t{arrival_times[i]}\t{service_times[i]}\t{tickets[i]}\t{waiting_times[i]}\t{turnaround_times[i]}"
+            )
+
+        print(f"Average Waiting Time: {sum(waiting_times)/n}")
+        print(f"Average Turnaround Time: {sum(turnaround_times)/n}")
+
+    return recorder.result(arrival_times, waiting_times, turnaround_times)
+
+
+if __name__ == "__main__":
+    arrival_times = [0, 1, 3, 4, 7]
+    service_times = [10, 2, 5, 9, 7]
+    tickets = [100, 50, 200, 100, 25]
+    stride(arrival_times, service_times, tickets, quantum=2, print_results=True)
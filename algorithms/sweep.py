@@ -0,0 +1,287 @@
+"""
+Quantum Sweeps
+Input: Arrival times, service times, candidate time quanta
+Output: Average waiting and turnaround times for each quantum
+"""
+
+import bisect
+import math
+from operator import add, mul
+
+from algorithms.lottery import FenwickTree
+from algorithms.mfq import MLFQSimulation
+
+__all__ = ["round_robin_sweep", "mlfq_sweep"]
+
+
+def _round_robin_coefficients(service_times, rounds_of):
+    """
+    Returns (A, B) such that the finish times of the processes under Round
+    Robin with quantum q sum to A + q * B, for every quantum that gives each
+    service time the number of rounds in `rounds_of`.
+
+    Process i finishing in round r has seen every process j before it in the
+    cycle run min(s_j, r * q) and every process after it min(s_j, (r - 1) * q),
+    which is s_j or a multiple of q depending only on the round of j.
+    """
+    max_round = max(rounds_of.values(), default=0)
+    count_below = [0] * (max_round + 2)  # processes finishing before round r
+    service_below = [0] * (max_round + 2)
+    for s in service_times:
+        if s > 0:
+            count_below[rounds_of[s] + 1] += 1
+            service_below[rounds_of[s] + 1] += s
+    for r in range(1, max_round + 2):
+        count_below[r] += count_below[r - 1]
+        service_below[r] += service_below[r - 1]
+    active = count_below[-1]
+
+    # Rounds of the processes seen so far, in cycle order
+    seen_counts = FenwickTree(max_round + 1)
+    seen_services = FenwickTree(max_round + 1)
+    seen = 0
+    A = B = 0
+    for s in service_times:
+        if s <= 0:
+            continue
+        r = rounds_of[s]
+        count_before_le = seen_counts.prefix_sum(r)
+        count_before_lt = seen_counts.prefix_sum(r - 1)
+        # Processes before it in the cycle
+        A += seen_services.prefix_sum(r) + s
+        B += r * (seen - count_before_le)
+        # Processes after it in the cycle
+        A += service_below[r] - seen_services.prefix_sum(r - 1)
+        B += (r - 1) * ((active - count_below[r]) - (seen - count_before_lt) - 1)
+        seen_counts.add(r, 1)
+        seen_services.add(r, s)
+        seen += 1
+    return A, B
+
+
+def _band(distinct, longest_quantum):
+    """
+    Returns how many positions apart two distinct service times can be and
+    still complete in the same round, which spans less than a quantum.
+    """
+    band = 0
+    for k, s in enumerate(distinct):
+        band = max(band, bisect.bisect_left(distinct, s + longest_quantum) - 1 - k)
+    return band
+
+
+def _pairs_near(service_times, distinct, band):
+    """
+    Returns, for every distinct service time distinct[k], a list whose entry
+    u - k + band counts the pairs of a process with service time distinct[u]
+    before one with distinct[k] in the cycle, for u within `band` of k.
+    """
+    index = {s: k for k, s in enumerate(distinct)}
+    before = [[0] * (2 * band + 1) for _ in distinct]
+    seen = [0] * (len(distinct) + 2 * band)  # entry u + band counts distinct[u]
+    for s in service_times:
+        if s > 0:
+            k = index[s]
+            before[k] = list(map(add, before[k], seen[k : k + 2 * band + 1]))
+            seen[k + band] += 1
+    return before
+
+
+def _changed_coefficients(service_times, distinct, quanta, band):
+    """
+    Yields (A, B) of `_round_robin_coefficients()` for every quantum of the
+    sorted `quanta`. Only the first one is computed from scratch; for the
+    next ones, longer quanta complete some service times in fewer rounds,
+    and only the pairs of processes with those service times change.
+
+    The service times are visited in increasing order, so the rounds always
+    increase with the service time and those sharing a round with the one
+    that changes are contiguous: the ones below it already in its new round
+    and the ones above it still in its old round. The pair counts of these
+    neighbours give the change in O(band) per distinct service time.
+    """
+    m = len(distinct)
+    index = {s: k for k, s in enumerate(distinct)}
+    counts = [0] * m
+    for s in service_times:
+        if s > 0:
+            counts[index[s]] += 1
+    before = _pairs_near(service_times, distinct, band)
+    counts_below = [0] * (m + 1)  # processes with the first k service times
+    services_below = [0] * (m + 1)
+    for k, s in enumerate(distinct):
+        counts_below[k + 1] = counts_below[k] + counts[k]
+        services_below[k + 1] = services_below[k] + counts[k] * s
+
+    rounds = [math.ceil(s / quanta[0]) for s in distinct]
+    A, B = _round_robin_coefficients(service_times, dict(zip(distinct, rounds)))
+    yield A, B
+
+    def next_change(k, start):
+        # First quantum from `start` that completes distinct[k] sooner
+        s, r = distinct[k], rounds[k]
+        return bisect.bisect_left(
+            quanta, True, lo=start, key=lambda q: math.ceil(s / q) < r
+        )
+
+    changes = {}  # quantum index -> distinct service times whose round drops
+    for k in range(m):
+        changes.setdefault(next_change(k, 1), []).append(k)
+    for i in range(1, len(quanta)):
+        for k in sorted(changes.pop(i, ())):
+            s, c = distinct[k], counts[k]
+            old, new = rounds[k], math.ceil(s / quanta[i])
+            row = before[k]
+            # Service times below it in its new round: from an earlier round
+            # to the same round
+            lo = bisect.bisect_left(rounds, new, 0, k)
+            pairs = row[lo - k + band : band]
+            ahead = sum(pairs)
+            ahead_services = sum(map(mul, pairs, distinct[lo:k]))
+            total = c * (counts_below[k] - counts_below[lo])
+            total_services = c * (services_below[k] - services_below[lo])
+            A += s * (total - ahead) - (total_services - ahead_services)
+            B += ahead - total
+            # Service times above it in its old round: from the same round
+            # to a later round, and all pairs with it finish a round sooner
+            hi = bisect.bisect_right(rounds, old, k + 1)
+            pairs = row[band + 1 : hi - k + band]
+            ahead = sum(pairs)
+            A += s * ahead - sum(map(mul, pairs, distinct[k + 1 : hi]))
+            B += ahead + (new - old) * (
+                c * (counts_below[m] - counts_below[k + 1]) + c * (c - 1) // 2
+            )
+            rounds[k] = new
+            changes.setdefault(next_change(k, i + 1), []).append(k)
+        yield A, B
+
+
+def round_robin_sweep(arrival_times, service_times, quanta):
+    """
+    Evaluates `round_robin()` for many time quanta together.
+
+    The finish times of a quantum only depend on the round in which each
+    service time completes, and sum to A + q * B for the quantum q. The
+    quanta are visited in increasing order and (A, B) is updated from one to
+    the next for the distinct service times whose round drops, each in time
+    proportional to the number of distinct service times close enough to it
+    to share a round (see `_changed_coefficients()`). The pairs of those are
+    counted in one pass over the processes. When the longest quantum lets
+    too many distinct service times share a round for that, every distinct
+    assignment of rounds costs an O(n log n) pass instead, which quanta
+    that share it (for instance all quanta at least as long as the longest
+    service time) reuse.
+
+    Args:
+        arrival_times (list): List of arrival times for each process.
+        service_times (list): List of service times for each process.
+        quanta (list): Time quanta to evaluate.
+
+    Returns:
+        list: One dict per quantum, in the order given, with the quantum and
+        the average waiting and turnaround times.
+    """
+    n = len(arrival_times)
+    distinct = sorted({s for s in service_times if s > 0})
+    # Processes without service never complete and keep zero times
+    arrival_total = sum(a for a, s in zip(arrival_times, service_times) if s > 0)
+    service_total = sum(s for s in service_times if s > 0)
+
+    ordered = sorted(set(quanta))
+    coefficients = {}  # quantum -> (A, B)
+    band = _band(distinct, ordered[-1]) if ordered else 0
+    width = 2 * band + 1
+    if width <= 64 * len(ordered) and width * len(distinct) <= 1 << 24:
+        updates = _changed_coefficients(service_times, distinct, ordered, band)
+        coefficients = dict(zip(ordered, updates))
+    else:
+        by_rounds = {}  # rounds of the distinct service times -> (A, B)
+        for quantum in ordered:
+            rounds = tuple(math.ceil(s / quantum) for s in distinct)
+            if rounds not in by_rounds:
+                by_rounds[rounds] = _round_robin_coefficients(
+                    service_times, dict(zip(distinct, rounds))
+                )
+            coefficients[quantum] = by_rounds[rounds]
+
+    curve = []
+    for quantum in quanta:
+        A, B = coefficients[quantum]
+        turnaround_total = A + quantum * B - arrival_total
+        curve.append(
+            {
+                "quantum": quantum,
+                "average_waiting_time": (turnaround_total - service_total) / n,
+                "average_turnaround_time": turnaround_total / n,
+            }
+        )
+    return curve
+
+
+def mlfq_sweep(arrival_times, service_times, quanta):
+    """
+    Evaluates `mlfq()` for many (t1, t2) pairs together.
+
+    All pairs schedule identically until the quantum counter of the first or
+    second queue runs out under the smallest t1 or t2, so that prefix is
+    simulated once and every pair is forked from it with its counters reduced
+    by the time already used.
+
+    Args:
+        arrival_times (list): List of arrival times for each process.
+        service_times (list): List of service times for each process.
+        quanta (list): (t1, t2) pairs to evaluate.
+
+    Returns:
+        list: One dict per pair, in the order given, with t1, t2 and the
+        average waiting and turnaround times.
+    """
+    n = len(arrival_times)
+    if not quanta:
+        return []
+    min_t1 = min(t1 for t1, _ in quanta)
+    min_t2 = min(t2 for _, t2 in quanta)
+
+    # Find the first decision at which the smallest quanta make a difference
+    shared = MLFQSimulation(arrival_times, service_times, t1=min_t1, t2=min_t2)
+    divergence = 0 if min(min_t1, min_t2) <= 0 else None
+    probe = shared.snapshot()
+    while divergence is None and not probe.done:
+        start = probe.time
+        counters = probe.time_quantum
+        probe.step()
+        # A demotion replaces the counters with new ones
+        if probe.time_quantum is not counters or min(counters[:2]) <= 0:
+            divergence = start
+    shared.run(divergence)
+
+    curve = []
+    for t1, t2 in quanta:
+        waiting_times, turnaround_times = shared.fork(t1=t1, t2=t2).run().results()
+        curve.append(
+            {
+                "t1": t1,
+                "t2": t2,
+                "average_waiting_time": sum(waiting_times) / n,
+                "average_turnaround_time": sum(turnaround_times) / n,
+            }
+        )
+    return curve
+
+
+if __name__ == "__main__":
+    arrival_times = [0, 1, 3, 4, 7]
+    service_times = [10, 2, 5, 9, 7]
+    print("Round Robin")
+    print("Quantum\tWaiting\tTurnaround")
+    for point in round_robin_sweep(arrival_times, service_times, range(1, 11)):
+        print(
+            f"{point['quantum']}\t{point['average_waiting_time']:.2f}\t{point['average_turnaround_time']:.2f}"
+        )
+    print("\nMulti-Level Feedback Queue")
+    print("t1\tt2\tWaiting\tTurnaround")
+    pairs = [(t1, t2) for t1 in (2, 4, 8) for t2 in (4, 8, 16)]
+    for point in mlfq_sweep(arrival_times, service_times, pairs):
+        print(
+            f"{point['t1']}\t{point['t2']}\t{point['average_waiting_time']:.2f}\t{point['average_turnaround_time']:.2f}"
+        )
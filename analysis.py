@@ -1,3 +1,23 @@
+"""
+Compares the scheduling algorithms on a set of sample inputs.
+
+Per-process results are kept in a persisted table (Parquet, or CSV when the
+path ends in .csv) and only the (input set, algorithm) cells whose workload,
+parameters or algorithm source changed since the last run are recomputed.
+The bar charts are rendered to image files with a non-interactive backend, so
+the report runs on headless machines.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+
 import pandas as pd
 import matplotlib.pyplot as plt
 from algorithms.fcfs import fcfs
@@ -7,101 +27,292 @@ from algorithms.spn import spn
 from algorithms.rr import round_robin
 from algorithms.mfq import mlfq as mfq
 from algorithms.custom import apsa
+from algorithms.lottery import lottery
+from algorithms.stride import stride
+from algorithms.edf import edf, deadline_report
+from algorithms.llf import llf
+from algorithms.cfs import cfs
+import algorithms.fused as fused_module
+from algorithms.fused import run_fused
 
 # Define the sample inputs
 inputs = {
     "All Short Jobs": {
         "arrival_times": [0, 2, 4, 6, 8],
         "service_times": [2, 3, 2, 4, 1],
+        "deadlines": [3, 7, 8, 12, 10],
     },
     "Mixed Job Lengths": {
         "arrival_times": [0, 1, 3, 5, 7],
         "service_times": [1, 8, 2, 7, 3],
+        "deadlines": [2, 12, 6, 20, 11],
     },
     "Heavy Load": {
         "arrival_times": [0, 0, 0, 0, 0],
         "service_times": [10, 2, 8, 6, 4],
+        "deadlines": [30, 5, 25, 15, 10],
     },
     "Light Load With Sporadic Long Jobs": {
         "arrival_times": [0, 5, 10, 15, 20],
         "service_times": [1, 12, 1, 12, 1],
+        "deadlines": [2, 20, 12, 30, 22],
     },
     "Staggered Mix": {
         "arrival_times": [0, 3, 5, 8, 12],
         "service_times": [8, 2, 10, 1, 5],
+        "deadlines": [10, 6, 25, 10, 20],
     },
 }
 
-# Define the algorithms
-algorithms = {
-    "FCFS": fcfs,
-    "Round Robin": round_robin,
-    "SPN": spn,
-    "SRT": srt,
-    "HRRN": hrrn,
-    "MFQ": mfq,
-}
-
 # Define a time quantum for those algorithms that need it
 time_quantum1 = 4
 time_quantum2 = 8
 
-# Prepare the results table
-results_data = {
-    "Input Set": [],
-    "Algorithm": [],
-    "Average Turnaround Time": [],
-    "Average Waiting Time": [],
+# Define the algorithms and the extra parameters they are called with
+algorithms = {
+    "FCFS": (fcfs, ()),
+    "Round Robin": (round_robin, (time_quantum1,)),
+    "SPN": (spn, ()),
+    "SRT": (srt, ()),
+    "HRRN": (hrrn, ()),
+    "MFQ": (mfq, (time_quantum1, time_quantum2)),
+    "Lottery": (lottery, (None, time_quantum1)),
+    "Stride": (stride, (None, time_quantum1)),
+    "EDF": (edf, ()),
+    "EDF (Non-Preemptive)": (edf, (False,)),
+    "LLF": (llf, ()),
+    "CFS": (cfs, ()),
 }
 
-# Run the algorithms for each input set and collect results
-for input_name, data in inputs.items():
-    for algo_name, algo_func in algorithms.items():
-        if algo_name == "Round Robin":
-            waiting_times, turnaround_times = algo_func(
-                data["arrival_times"], data["service_times"], time_quantum1
-            )
-        elif algo_name == "MFQ":
-            waiting_times, turnaround_times = algo_func(
-                data["arrival_times"],
-                data["service_times"],
-                time_quantum1,
-                time_quantum2,
-            )
-        elif algo_name == "APSA":
-            waiting_times, turnaround_times = algo_func(
-                data["arrival_times"], data["service_times"], 0.5, 10
-            )
-        else:
-            waiting_times, turnaround_times = algo_func(
-                data["arrival_times"], data["service_times"]
-            )
-
-        avg_turnaround_time = sum(turnaround_times) / len(turnaround_times)
-        avg_waiting_time = sum(waiting_times) / len(waiting_times)
-
-        results_data["Input Set"].append(input_name)
-        results_data["Algorithm"].append(algo_name)
-        results_data["Average Turnaround Time"].append(avg_turnaround_time)
-        results_data["Average Waiting Time"].append(avg_waiting_time)
-
-# Convert to DataFrame for easy tabular display
-results_df = pd.DataFrame(results_data)
-print(results_df)
-
-# Plotting the results
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 7))
-results_df.pivot(
-    index="Algorithm", columns="Input Set", values="Average Turnaround Time"
-).plot(kind="bar", ax=ax1)
-ax1.set_title("Average Turnaround Time by Algorithm")
-ax1.set_ylabel("Time Units")
-
-results_df.pivot(
-    index="Algorithm", columns="Input Set", values="Average Waiting Time"
-).plot(kind="bar", ax=ax2)
-ax2.set_title("Average Waiting Time by Algorithm")
-ax2.set_ylabel("Time Units")
-
-plt.tight_layout()
-plt.show()
+# Algorithms that take the deadlines of the input set as their third argument
+deadline_algorithms = {"EDF", "EDF (Non-Preemptive)", "LLF"}
+
+KEY_COLUMNS = ["Input Set", "Algorithm"]
+STAMP_COLUMNS = ["Workload Hash", "Parameters", "Algorithm Version"]
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+
+def algorithm_modules(module):
+    """
+    Returns the modules of the algorithms package that `module` uses,
+    directly or through other modules of the package, including itself.
+    """
+    modules = {}
+    pending = [module]
+    while pending:
+        module = pending.pop()
+        if module.__name__ in modules:
+            continue
+        modules[module.__name__] = module
+        for value in vars(module).values():
+            used = value if inspect.ismodule(value) else inspect.getmodule(value)
+            if used is not None and used.__name__.startswith("algorithms."):
+                pending.append(used)
+    return [modules[name] for name in sorted(modules)]
+
+
+def cell_stamp(data, algo_func, params):
+    """
+    Returns what a result cell depends on: the workload, the parameters and
+    the source code of the algorithm's module, of the modules it builds on,
+    such as the simulation engine, of the fused runner that computes every
+    cell and of `cell_rows()` with the deadline report it adds.
+    """
+    workload = json.dumps(data, sort_keys=True)
+    modules = algorithm_modules(inspect.getmodule(algo_func))
+    for module in (fused_module, inspect.getmodule(deadline_report)):
+        if module not in modules:
+            modules.append(module)
+    source = "".join(inspect.getsource(module) for module in modules)
+    source += inspect.getsource(cell_rows)
+    return _digest(workload), json.dumps(list(params)), _digest(source)
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return None
+    if path.endswith(".csv"):
+        return pd.read_csv(path)
+    return pd.read_parquet(path)
+
+
+def save_results(results_df, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".csv"):
+        results_df.to_csv(path, index=False)
+    else:
+        results_df.to_parquet(path, index=False)
+
+
+def cell_rows(input_name, algo_name, data, waiting_times, turnaround_times, stamp):
+    """
+    Returns the per-process rows of one algorithm's results on one input set.
+    """
+    report = deadline_report(data["arrival_times"], turnaround_times, data["deadlines"])
+    n = len(waiting_times)
+    return pd.DataFrame(
+        {
+            "Input Set": [input_name] * n,
+            "Algorithm": [algo_name] * n,
+            "Process": range(1, n + 1),
+            "Waiting Time": waiting_times,
+            "Turnaround Time": turnaround_times,
+            "Lateness": report["lateness"],
+            "Workload Hash": [stamp[0]] * n,
+            "Parameters": [stamp[1]] * n,
+            "Algorithm Version": [stamp[2]] * n,
+        }
+    )
+
+
+def run_input(input_name, algo_names, data, stamps):
+    """
+    Runs the given algorithms on one input set in a single fused pass over its
+    processes and returns their per-process rows.
+    """
+    selected = {}
+    for algo_name in algo_names:
+        algo_func, params = algorithms[algo_name]
+        if algo_name in deadline_algorithms:
+            params = (data["deadlines"], *params)
+        selected[algo_name] = (algo_func, params)
+    results = run_fused(zip(data["arrival_times"], data["service_times"]), selected)
+    return [
+        cell_rows(
+            input_name,
+            algo_name,
+            data,
+            *results[algo_name],
+            stamps[(input_name, algo_name)],
+        )
+        for algo_name in algo_names
+    ]
+
+
+def update_results(previous_df):
+    """
+    Brings the per-process results table up to date.
+
+    Cells whose stamp matches the previous table are reused, all others are
+    recomputed, and cells of removed inputs or algorithms are dropped.
+
+    Returns:
+        tuple: The updated table and the list of recomputed cells.
+    """
+    stamps = {
+        (input_name, algo_name): cell_stamp(data, algo_func, params)
+        for input_name, data in inputs.items()
+        for algo_name, (algo_func, params) in algorithms.items()
+    }
+    expected = pd.DataFrame(
+        [key + stamp for key, stamp in stamps.items()],
+        columns=KEY_COLUMNS + STAMP_COLUMNS,
+    )
+
+    if previous_df is None:
+        previous_df = pd.DataFrame(columns=KEY_COLUMNS + STAMP_COLUMNS)
+    reused = previous_df.merge(expected, on=KEY_COLUMNS + STAMP_COLUMNS)
+    fresh = expected.merge(
+        reused[KEY_COLUMNS].drop_duplicates(), how="left", indicator=True
+    )
+    recomputed = list(
+        fresh.loc[fresh["_merge"] == "left_only", KEY_COLUMNS].itertuples(
+            index=False, name=None
+        )
+    )
+
+    stale = {}  # input set -> algorithms to recompute on it
+    for input_name, algo_name in recomputed:
+        stale.setdefault(input_name, []).append(algo_name)
+    frames = [reused]
+    for input_name, algo_names in stale.items():
+        frames.extend(run_input(input_name, algo_names, inputs[input_name], stamps))
+    results_df = pd.concat(frames, ignore_index=True)
+    results_df = results_df.sort_values(KEY_COLUMNS + ["Process"], ignore_index=True)
+    return results_df, recomputed
+
+
+def summarize(results_df):
+    """
+    Averages the per-process results of every (input set, algorithm) cell and
+    counts its missed deadlines.
+    """
+    return (
+        results_df.assign(Missed=results_df["Lateness"] > 0)
+        .groupby(KEY_COLUMNS, sort=False, as_index=False)
+        .agg(
+            **{
+                "Average Turnaround Time": ("Turnaround Time", "mean"),
+                "Average Waiting Time": ("Waiting Time", "mean"),
+                "Deadline Misses": ("Missed", "sum"),
+            }
+        )
+    )
+
+
+def render_charts(summary_df, output_dir, formats=("png", "svg")):
+    """
+    Renders the average turnaround time, average waiting time and deadline
+    miss bar charts to files.
+
+    Returns:
+        list: Paths of the written files.
+    """
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(21, 7))
+    summary_df.pivot(
+        index="Algorithm", columns="Input Set", values="Average Turnaround Time"
+    ).plot(kind="bar", ax=ax1)
+    ax1.set_title("Average Turnaround Time by Algorithm")
+    ax1.set_ylabel("Time Units")
+
+    summary_df.pivot(
+        index="Algorithm", columns="Input Set", values="Average Waiting Time"
+    ).plot(kind="bar", ax=ax2)
+    ax2.set_title("Average Waiting Time by Algorithm")
+    ax2.set_ylabel("Time Units")
+
+    summary_df.pivot(
+        index="Algorithm", columns="Input Set", values="Deadline Misses"
+    ).plot(kind="bar", ax=ax3)
+    ax3.set_title("Deadline Misses by Algorithm")
+    ax3.set_ylabel("Processes")
+
+    plt.tight_layout()
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, f"analysis.{fmt}") for fmt in formats]
+    for path in paths:
+        fig.savefig(path)
+    plt.close(fig)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--results",
+        default=os.path.join("reports", "results.parquet"),
+        help="Persisted per-process results table (.parquet or .csv).",
+    )
+    parser.add_argument(
+        "--output-dir", default="reports", help="Directory for the chart files."
+    )
+    parser.add_argument(
+        "--formats", nargs="+", default=["png", "svg"], help="Chart file formats."
+    )
+    args = parser.parse_args()
+
+    results_df, recomputed = update_results(load_results(args.results))
+    save_results(results_df, args.results)
+    print(f"Recomputed {len(recomputed)} of {len(inputs) * len(algorithms)} cells")
+
+    summary_df = summarize(results_df)
+    print(summary_df)
+    for path in render_charts(summary_df, args.output_dir, args.formats):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Load test for the local simulation service (service.py).
+
+Starts the service in a subprocess (unless --port of a running one is given),
+then keeps a number of concurrent keep-alive clients busy with simulation
+requests and reports the requests per second and latency percentiles. A share
+of the requests repeats earlier workloads to exercise the result cache.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from statistics import quantiles
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def random_job(rng, num_processes):
+    arrival_times = sorted(rng.randint(0, 5 * num_processes) for _ in range(num_processes))
+    service_times = [rng.randint(1, 10) for _ in range(num_processes)]
+    algorithm, params = rng.choice(
+        [
+            ("fcfs", {}),
+            ("spn", {}),
+            ("srt", {}),
+            ("hrrn", {}),
+            ("round_robin", {"quantum": 4}),
+            ("mlfq", {"t1": 4, "t2": 8}),
+            ("apsa", {"WAITING_TIME_FACTOR": 0.5, "ARRIVAL_TIME_FACTOR": 10}),
+            ("stride", {"quantum": 2}),
+            ("cfs", {}),
+        ]
+    )
+    return {
+        "algorithm": algorithm,
+        "arrival_times": arrival_times,
+        "service_times": service_times,
+        "params": params,
+    }
+
+
+async def post(reader, writer, payload):
+    """
+    Sends one request on a keep-alive connection and reads the streamed lines.
+    """
+    body = json.dumps(payload).encode()
+    writer.write(
+        b"POST /simulate HTTP/1.1\r\nHost: localhost\r\n"
+        b"Content-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+        % (len(body), body)
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        return status, []
+    lines = []
+    while True:
+        size = int(await reader.readline(), 16)
+        chunk = await reader.readexactly(size + 2)
+        if size == 0:
+            return status, lines
+        lines.append(json.loads(chunk))
+
+
+async def client(port, jobs, rng, deadline, jobs_per_request, latencies, failures):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            payload = {"jobs": [rng.choice(jobs) for _ in range(jobs_per_request)]}
+            start = time.perf_counter()
+            status, lines = await post(reader, writer, payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200 or any("error" in line for line in lines):
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def wait_for_port(port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def run(args):
+    server = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        service = os.path.join(os.path.dirname(os.path.abspath(__file__)), "service.py")
+        server = subprocess.Popen(
+            [sys.executable, service, "--port", str(port)], stdout=subprocess.DEVNULL
+        )
+    try:
+        await wait_for_port(port)
+        rng = random.Random(args.seed)
+        jobs = [random_job(rng, args.processes) for _ in range(args.distinct)]
+        latencies = []
+        failures = []
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *[
+                client(
+                    port,
+                    jobs,
+                    random.Random(args.seed + i),
+                    deadline,
+                    args.jobs_per_request,
+                    latencies,
+                    failures,
+                )
+                for i in range(args.concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            # The service shuts its worker pool down on SIGTERM
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+    percentiles = quantiles(latencies, n=100)
+    print(f"Requests: {len(latencies)} in {elapsed:.1f}s ({len(failures)} failed)")
+    print(f"Requests per second: {len(latencies) / elapsed:.1f}")
+    print(f"Jobs per second: {len(latencies) * args.jobs_per_request / elapsed:.1f}")
+    for label, q in (("p50", 49), ("p90", 89), ("p99", 98)):
+        print(f"Latency {label}: {percentiles[q] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, help="Port of a running service.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--jobs-per-request", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=50, help="Processes per job.")
+    parser.add_argument("--distinct", type=int, default=2000, help="Distinct jobs drawn from.")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Monte-Carlo replication driver for comparing scheduling algorithms.
+
+Every replication draws one seeded random workload and runs it through each
+selected algorithm (common random numbers), so differences between policies are
+not drowned in workload noise. Running means and variances are kept with
+Welford updates and replications stop as soon as the Student-t confidence
+interval of every (algorithm, metric) pair is narrower than the requested
+tolerance.
+"""
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from statistics import NormalDist
+
+from algorithms.fcfs import fcfs
+from algorithms.hrrn import hrrn
+from algorithms.srt import srt
+from algorithms.spn import spn
+from algorithms.rr import round_robin
+from algorithms.mfq import mlfq as mfq
+from algorithms.custom import apsa
+
+__all__ = [
+    "RunningStat",
+    "t_quantile",
+    "random_workload",
+    "run_replication",
+    "replicate",
+]
+
+# Algorithms and the extra parameters they are called with
+algorithms = {
+    "FCFS": (fcfs, ()),
+    "Round Robin": (round_robin, (4,)),
+    "SPN": (spn, ()),
+    "SRT": (srt, ()),
+    "HRRN": (hrrn, ()),
+    "MFQ": (mfq, (4, 8)),
+    "APSA": (apsa, (0.5, 10)),
+}
+
+METRICS = ("Average Waiting Time", "Average Turnaround Time")
+
+
+def _t_central(t, df):
+    """
+    P(-t < T < t) for Student's t distribution with an integer number of
+    degrees of freedom, in closed form (Abramowitz and Stegun 26.7.3, 26.7.4).
+    """
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    if df % 2:
+        term = total = 0.0
+        if df > 1:
+            term = total = 1.0
+            for k in range(3, df - 1, 2):
+                term *= cos2 * (k - 1) / k
+                total += term
+        return 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    term = total = 1.0
+    for k in range(2, df - 1, 2):
+        term *= cos2 * (k - 1) / k
+        total += term
+    return math.sin(theta) * total
+
+
+@lru_cache(maxsize=None)
+def t_quantile(p, df):
+    """
+    Quantile of Student's t distribution with `df` degrees of freedom.
+
+    Newton's method on the closed-form distribution function, started from
+    the normal quantile, which lies between 0 and the t quantile.
+    """
+    if p < 0.5:
+        return -t_quantile(1 - p, df)
+    target = 2 * p - 1
+    log_density = (
+        math.lgamma((df + 1) / 2)
+        - math.lgamma(df / 2)
+        - 0.5 * math.log(df * math.pi)
+    )
+    t = NormalDist().inv_cdf(p)
+    for _ in range(200):
+        density = math.exp(log_density - (df + 1) / 2 * math.log1p(t * t / df))
+        step = (target - _t_central(t, df)) / (2 * density)
+        t += step
+        if step <= 1e-12 * t:
+            break
+    return t
+
+
+class RunningStat:
+    """
+    Running mean and variance of a stream of samples (Welford's algorithm).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return float("inf")
+        return self.m2 / (self.count - 1)
+
+    def half_width(self, confidence):
+        """
+        Half width of the Student-t confidence interval of the mean, which
+        stays valid for the few replications the stopping rule may end on.
+        """
+        if self.count < 2:
+            return float("inf")
+        t = t_quantile((1 + confidence) / 2, self.count - 1)
+        return t * (self.variance / self.count) ** 0.5
+
+
+def random_workload(rng, num_processes, mean_interarrival, mean_service):
+    """
+    Draws a random workload with exponential inter-arrival and service times.
+
+    Args:
+        rng (random.Random): Seeded random number generator.
+        num_processes (int): Number of processes in the workload.
+        mean_interarrival (float): Mean time between two arrivals.
+        mean_service (float): Mean service (burst) time.
+
+    Returns:
+        tuple: Lists of integer arrival times and service times, sorted by arrival.
+    """
+    arrival_times = []
+    service_times = []
+    arrival = 0.0
+    for _ in range(num_processes):
+        arrival_times.append(int(arrival))
+        service_times.append(max(1, round(rng.expovariate(1 / mean_service))))
+        arrival += rng.expovariate(1 / mean_interarrival)
+    return arrival_times, service_times
+
+
+def run_replication(seed, index, algo_names, workload_params):
+    """
+    Runs one replication: a single random workload through every algorithm.
+
+    The workload only depends on `seed` and `index`, so all algorithms see the
+    same jobs and the result does not depend on which worker ran it.
+
+    Returns:
+        dict: Maps (algorithm, metric) to the metric value of this replication.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    arrival_times, service_times = random_workload(rng, **workload_params)
+    n = len(arrival_times)
+    samples = {}
+    for name in algo_names:
+        algo_func, params = algorithms[name]
+        waiting_times, turnaround_times = algo_func(arrival_times, service_times, *params)
+        samples[(name, METRICS[0])] = sum(waiting_times) / n
+        samples[(name, METRICS[1])] = sum(turnaround_times) / n
+    return samples
+
+
+def replicate(
+    algo_names=None,
+    tolerance=1.0,
+    relative_tolerance=0.05,
+    confidence=0.95,
+    min_replications=10,
+    max_replications=1000,
+    seed=0,
+    max_workers=None,
+    batch_size=None,
+    num_processes=20,
+    mean_interarrival=4.0,
+    mean_service=3.0,
+):
+    """
+    Runs replications until every confidence interval is narrow enough.
+
+    Replications are simulated in parallel batches but folded into the running
+    statistics in index order, so the stopping point and the estimates are the
+    same for any number of workers.
+
+    Args:
+        algo_names (list, optional): Algorithms to compare. Defaults to all.
+        tolerance (float): Largest accepted confidence interval half width.
+        relative_tolerance (float, optional): Largest accepted half width as a
+            fraction of the mean; an interval is narrow enough when it meets
+            either tolerance.
+        confidence (float): Confidence level of the intervals.
+        min_replications (int): Replications run before stopping is considered.
+        max_replications (int): Upper bound on the number of replications.
+        seed (int): Base seed of the random workloads.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count.
+        batch_size (int, optional): Replications submitted at once. Defaults to
+            twice the number of workers.
+        num_processes, mean_interarrival, mean_service: Workload parameters.
+
+    Returns:
+        dict: Running statistics per (algorithm, metric), the number of
+        replications used and simulated, and the compute saved compared with
+        running `max_replications` replications.
+    """
+    if algo_names is None:
+        algo_names = list(algorithms)
+    workload_params = {
+        "num_processes": num_processes,
+        "mean_interarrival": mean_interarrival,
+        "mean_service": mean_service,
+    }
+    stats = {(name, metric): RunningStat() for name in algo_names for metric in METRICS}
+
+    used = 0
+    simulated = 0
+    converged = False
+    if batch_size is None:
+        batch_size = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while not converged and used < max_replications:
+            indices = range(used, min(used + batch_size, max_replications))
+            futures = [
+                executor.submit(run_replication, seed, i, algo_names, workload_params)
+                for i in indices
+            ]
+            simulated += len(futures)
+            for future in futures:
+                if converged:
+                    simulated -= future.cancel()
+                    continue
+                for key, value in future.result().items():
+                    stats[key].update(value)
+                used += 1
+                converged = used >= min_replications and all(
+                    stat.half_width(confidence)
+                    <= max(tolerance, (relative_tolerance or 0) * abs(stat.mean))
+                    for stat in stats.values()
+                )
+
+    return {
+        "stats": stats,
+        "confidence": confidence,
+        "converged": converged,
+        "replications": used,
+        "simulated": simulated,
+        "max_replications": max_replications,
+        "saved": 1 - simulated / max_replications,
+    }
+
+
+if __name__ == "__main__":
+    report = replicate()
+    print("Algorithm\tMetric\t\t\tMean\tHalf Width")
+    for (name, metric), stat in report["stats"].items():
+        print(f"{name}\t{metric}\t{stat.mean:.2f}\t{stat.half_width(report['confidence']):.3f}")
+    status = "converged" if report["converged"] else "did not converge"
+    print(f"\nReplications: {report['replications']} ({status})")
+    print(f"Simulated: {report['simulated']} of at most {report['max_replications']}")
+    print(f"Compute saved vs. fixed replication count: {report['saved']:.1%}")
@@ -0,0 +1,498 @@
+"""
+Local simulation service.
+
+Runs the scheduling algorithms behind a small asyncio HTTP/JSON server on
+localhost (or a Unix socket). Simulation jobs are queued with backpressure,
+coalesced into batches for a process pool and streamed back as newline
+delimited JSON as soon as each one completes. Repeated jobs are answered from
+a result cache. Parameters are checked against the algorithm before a job is
+queued, and the jobs of a batch that runs past --batch-timeout fail instead
+of holding a worker.
+
+Endpoints:
+    POST /simulate  Body: one job or {"jobs": [job, ...]}, where a job is
+                    {"algorithm": "round_robin", "arrival_times": [...],
+                    "service_times": [...], "params": {"quantum": 4}}.
+                    Responds with one JSON line per job, in completion order;
+                    EDF and LLF jobs also report their deadline misses.
+    GET /stats      Counters of the service.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import os
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.fcfs import fcfs
+from algorithms.hrrn import hrrn
+from algorithms.srt import srt
+from algorithms.spn import spn
+from algorithms.rr import round_robin
+from algorithms.mfq import mlfq
+from algorithms.custom import apsa
+from algorithms.lottery import lottery
+from algorithms.stride import stride
+from algorithms.edf import edf
+from algorithms.llf import llf
+from algorithms.cfs import cfs
+
+__all__ = ["SimulationService", "Overloaded", "run_batch", "serve"]
+
+# Algorithms by the name jobs refer to them with; params are passed as keywords
+ALGORITHMS = {
+    "fcfs": fcfs,
+    "round_robin": round_robin,
+    "spn": spn,
+    "srt": srt,
+    "hrrn": hrrn,
+    "mlfq": mlfq,
+    "apsa": apsa,
+    "lottery": lottery,
+    "stride": stride,
+    "edf": edf,
+    "llf": llf,
+    "cfs": cfs,
+}
+
+# Parameters that must be positive, or at least zero, for the algorithms to
+# make progress, and parameters with one number per process
+POSITIVE_PARAMS = {
+    "quantum",
+    "t1",
+    "t2",
+    "min_granularity",
+    "target_latency",
+    "ARRIVAL_TIME_FACTOR",
+}
+NON_NEGATIVE_PARAMS = {"WAITING_TIME_FACTOR"}
+PER_PROCESS_PARAMS = {"tickets", "deadlines", "nice"}
+
+# Fields of the deadline report that EDF and LLF results also carry
+DEADLINE_FIELDS = ("lateness", "misses", "max_lateness", "first_miss_time")
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    """
+    Raised when the job queue stays full for longer than the queue timeout.
+    """
+
+
+def _is_number(value):
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+def validate_params(algorithm, params, num_processes):
+    """
+    Checks the parameters of a job against the algorithm's signature and the
+    ranges in which it terminates.
+    """
+    signature = inspect.signature(ALGORITHMS[algorithm]).parameters
+    names = list(signature)[2:]  # after the arrival and service times
+    names.remove("print_results")
+    for name in params:
+        if name not in names:
+            raise ValueError(f"Unknown parameter for {algorithm}: {name!r}.")
+    for name in names:
+        if name not in params and signature[name].default is inspect.Parameter.empty:
+            raise ValueError(f"Missing parameter for {algorithm}: {name!r}.")
+    for name, value in params.items():
+        if name in PER_PROCESS_PARAMS:
+            if value is None and signature[name].default is None:
+                continue
+            if (
+                not isinstance(value, list)
+                or len(value) != num_processes
+                or not all(map(_is_number, value))
+            ):
+                raise ValueError(f"{name} must be a list of one number per process.")
+        elif name in POSITIVE_PARAMS:
+            if not _is_number(value) or value <= 0:
+                raise ValueError(f"{name} must be a positive number.")
+        elif name in NON_NEGATIVE_PARAMS:
+            if not _is_number(value) or value < 0:
+                raise ValueError(f"{name} must be a non-negative number.")
+        elif name == "preemptive" and not isinstance(value, bool):
+            raise ValueError("preemptive must be true or false.")
+
+
+def validate_job(job):
+    """
+    Checks a job and returns its canonical form, which is also its cache key.
+    """
+    if not isinstance(job, dict):
+        raise ValueError("A job must be a JSON object.")
+    if job.get("algorithm") not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {job.get('algorithm')!r}.")
+    arrival_times = job.get("arrival_times")
+    service_times = job.get("service_times")
+    if not isinstance(arrival_times, list) or not isinstance(service_times, list):
+        raise ValueError("arrival_times and service_times must be lists.")
+    if len(arrival_times) != len(service_times) or not arrival_times:
+        raise ValueError("arrival_times and service_times must have the same, non-zero length.")
+    if not all(map(_is_number, arrival_times)) or not all(
+        map(_is_number, service_times)
+    ):
+        raise ValueError("Arrival and service times must be finite numbers.")
+    if min(arrival_times) < 0 or min(service_times) < 0:
+        raise ValueError("Arrival and service times cannot be negative.")
+    params = job.get("params", {})
+    if not isinstance(params, dict):
+        raise ValueError("params must be a JSON object.")
+    validate_params(job["algorithm"], params, len(arrival_times))
+    return json.dumps(
+        [job["algorithm"], arrival_times, service_times, params], sort_keys=True
+    )
+
+
+def _time_out(signum, frame):
+    raise TimeoutError("The batch ran out of time.")
+
+
+def run_batch(keys, timeout=None):
+    """
+    Runs a batch of canonical jobs in a worker process.
+
+    Args:
+        keys (list): The canonical jobs.
+        timeout (float, optional): Seconds the batch may run. The job running
+            when they are up and the jobs after it fail, so the worker is free
+            again. Only enforced where SIGALRM exists.
+
+    Returns:
+        list: One (ok, result) pair per job, where result is the simulation
+        output or the error message.
+    """
+    results = []
+    timed = timeout is not None and hasattr(signal, "setitimer")
+    if timed:
+        signal.signal(signal.SIGALRM, _time_out)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        for key in keys:
+            algorithm, arrival_times, service_times, params = json.loads(key)
+            try:
+                result = ALGORITHMS[algorithm](arrival_times, service_times, **params)
+                waiting_times, turnaround_times = result
+            except TimeoutError:
+                raise
+            except Exception as e:  # reported to the client of this job only
+                results.append((False, f"{type(e).__name__}: {e}"))
+            else:
+                output = {
+                    "waiting_times": waiting_times,
+                    "turnaround_times": turnaround_times,
+                }
+                for name in DEADLINE_FIELDS:
+                    if hasattr(result, name):
+                        output[name] = getattr(result, name)
+                results.append((True, output))
+    except TimeoutError as e:
+        results.extend([(False, f"TimeoutError: {e}")] * (len(keys) - len(results)))
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return results
+
+
+class SimulationService:
+    """
+    Queues, batches, runs and caches simulation jobs.
+
+    Args:
+        max_queue (int): Jobs that may wait for a worker before new jobs block.
+        queue_timeout (float): Seconds a job may block on a full queue before
+            the request is rejected with 503.
+        batch_size (int): Largest number of jobs sent to a worker at once.
+        batch_window (float): Seconds the batcher waits to fill a batch.
+        cache_size (int): Number of job results kept.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count.
+        batch_timeout (float): Seconds a batch may run before its jobs fail
+            and their cache entries are dropped.
+    """
+
+    def __init__(
+        self,
+        max_queue=1024,
+        queue_timeout=1.0,
+        batch_size=32,
+        batch_window=0.002,
+        cache_size=4096,
+        max_workers=None,
+        batch_timeout=10.0,
+    ):
+        self.queue = asyncio.Queue(max_queue)
+        self.queue_timeout = queue_timeout
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.cache_size = cache_size
+        self.batch_timeout = batch_timeout
+        self.cache = OrderedDict()  # canonical job -> future of its result
+        max_workers = max_workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers)
+        # Bounds the batches in flight, so a full pool backs up into the queue
+        self.slots = asyncio.Semaphore(2 * max_workers)
+        self.stats = {
+            "requests": 0,
+            "jobs": 0,
+            "cache_hits": 0,
+            "rejected": 0,
+            "batches": 0,
+            "batched_jobs": 0,
+            "timed_out_batches": 0,
+        }
+        self.batcher = None
+        self.running = set()  # batches waiting for their results
+        self.connections = set()  # tasks of the open client connections
+
+    async def start(self):
+        self.batcher = asyncio.create_task(self._batch_loop())
+
+    async def close(self):
+        for connection in list(self.connections):
+            connection.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.batcher:
+            self.batcher.cancel()
+        for waiter in list(self.running):
+            waiter.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def submit(self, job):
+        """
+        Queues a job, or joins the identical job that is cached or in flight.
+
+        Returns:
+            asyncio.Future: Resolves to the (ok, result) pair of the job.
+        """
+        key = validate_job(job)
+        self.stats["jobs"] += 1
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return self.cache[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self.cache[key] = future
+        try:
+            await asyncio.wait_for(self.queue.put((key, future)), self.queue_timeout)
+        except asyncio.TimeoutError:
+            del self.cache[key]
+            self.stats["rejected"] += 1
+            raise Overloaded("The job queue is full.")
+        self._evict()
+        return future
+
+    def _evict(self):
+        while len(self.cache) > self.cache_size:
+            key, future = next(iter(self.cache.items()))
+            if not future.done():
+                break
+            del self.cache[key]
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.stats["batches"] += 1
+            self.stats["batched_jobs"] += len(batch)
+            keys = [key for key, _ in batch]
+            task = loop.run_in_executor(
+                self.pool, run_batch, keys, self.batch_timeout
+            )
+            waiter = asyncio.ensure_future(self._deliver(batch, task))
+            self.running.add(waiter)
+            waiter.add_done_callback(self.running.discard)
+
+    async def _deliver(self, batch, task):
+        # The worker stops the batch itself at the timeout; this one only
+        # fires if it cannot, and then leaves the worker busy
+        try:
+            results = await asyncio.wait_for(task, self.batch_timeout + 1)
+        except asyncio.TimeoutError:
+            results = [(False, "TimeoutError: The batch ran out of time.")] * len(batch)
+        except asyncio.CancelledError:
+            results = [(False, "Cancelled")] * len(batch)
+        except Exception as e:
+            results = [(False, repr(e))] * len(batch)
+        finally:
+            self.slots.release()
+        if any(not ok and result.startswith("TimeoutError") for ok, result in results):
+            self.stats["timed_out_batches"] += 1
+        for (key, future), (ok, result) in zip(batch, results):
+            if not ok:
+                # Errors are not cached, a retry runs the job again
+                self.cache.pop(key, None)
+            if not future.done():
+                future.set_result((ok, result))
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if method == "POST" and path == "/simulate":
+                    await self._simulate(body, writer)
+                elif method == "GET" and path == "/stats":
+                    stats = dict(self.stats, queued=self.queue.qsize(), cached=len(self.cache))
+                    await write_json(writer, 200, stats)
+                else:
+                    await write_json(writer, 404, {"error": "Not found."})
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # close() cancels the open connections; ending normally keeps the
+            # stream's done callback from reporting the cancellation
+            pass
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def _simulate(self, body, writer):
+        self.stats["requests"] += 1
+        try:
+            payload = json.loads(body)
+            jobs = payload["jobs"] if "jobs" in payload else [payload]
+            futures = [await self.submit(job) for job in jobs]
+        except Overloaded as e:
+            await write_json(writer, 503, {"error": str(e)})
+            return
+        except (ValueError, TypeError, KeyError) as e:
+            await write_json(writer, 400, {"error": str(e)})
+            return
+
+        async def tagged(index, future):
+            ok, result = await asyncio.shield(future)
+            if ok:
+                return dict(result, id=index)
+            return {"id": index, "error": result}
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        tasks = [asyncio.ensure_future(tagged(i, f)) for i, f in enumerate(futures)]
+        for next_result in asyncio.as_completed(tasks):
+            line = json.dumps(await next_result).encode() + b"\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def write_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, unix_socket=None, **service_options):
+    service = SimulationService(**service_options)
+    await service.start()
+    if unix_socket:
+        server = await asyncio.start_unix_server(service.handle_connection, unix_socket)
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Serving on {unix_socket or f'http://{host}:{port}'}", flush=True)
+    # SIGTERM shuts down like Ctrl+C, so the pool workers are not orphaned
+    loop = asyncio.get_running_loop()
+    stopped = loop.create_future()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stopped.cancel)
+    except NotImplementedError:  # no signal handlers on this event loop
+        pass
+    try:
+        async with server:
+            await stopped
+    except asyncio.CancelledError:
+        if not stopped.cancelled():
+            raise
+    finally:
+        try:
+            loop.remove_signal_handler(signal.SIGTERM)
+        except NotImplementedError:
+            pass
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local scheduling simulation service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="Listen on this Unix socket instead.")
+    parser.add_argument("--workers", type=int, help="Worker processes.")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batch-window", type=float, default=0.002)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument(
+        "--batch-timeout", type=float, default=10.0, help="Seconds a batch may run."
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                args.unix_socket,
+                max_workers=args.workers,
+                batch_size=args.batch_size,
+                batch_window=args.batch_window,
+                max_queue=args.max_queue,
+                cache_size=args.cache_size,
+                batch_timeout=args.batch_timeout,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
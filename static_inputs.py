@@ -10,6 +10,7 @@ from algorithms.spn import spn
 from algorithms.rr import round_robin
 from algorithms.mfq import mlfq as mfq
 from algorithms.custom import apsa
+from algorithms.fused import run_fused
 
 # define static inputs
 arrival_times = [0, 1, 3, 4, 7]
@@ -18,17 +19,26 @@ service_times = [10, 2, 5, 9, 7]
 # time quanta for some algorithms
 time_quanta = 7
 
-# now call all of the  algorithms with print_results=True
-fcfs(arrival_times, service_times, print_results=True)
-print("\n")
-round_robin(arrival_times, service_times, time_quanta, print_results=True)
-print("\n")
-spn(arrival_times, service_times, print_results=True)
-print("\n")
-srt(arrival_times, service_times, print_results=True)
-print("\n")
-hrrn(arrival_times, service_times, print_results=True)
-print("\n")
-mfq(arrival_times, service_times, 8, 16, print_results=True)
-print("\n")
-apsa(arrival_times, service_times, 0.5, 10, print_results=True)
+algorithms = {
+    "First-Come-First-Served": (fcfs, ()),
+    "Round Robin": (round_robin, (time_quanta,)),
+    "Shortest Process Next": (spn, ()),
+    "Shortest Remaining Time": (srt, ()),
+    "Highest Response Ratio Next": (hrrn, ()),
+    "Multi-Level Feedback Queue": (mfq, (8, 16)),
+    "Adaptive Priority Scheduling Algorithm": (apsa, (0.5, 10)),
+}
+
+# run all of the algorithms in one pass over the inputs and print the results
+results = run_fused(zip(arrival_times, service_times), algorithms)
+for name, (waiting_times, turnaround_times) in results.items():
+    n = len(waiting_times)
+    print(name)
+    print("Process\tArrival\tService\tWaiting\tTurnaround")
+    for i in range(n):
+        print(
+            f"{i+1}\t{arrival_times[i]}\t{service_times[i]}\t{waiting_times[i]}\t{turnaround_times[i]}"
+        )
+    print(f"Average Waiting Time: {sum(waiting_times) / n:.2f}")
+    print(f"Average Turnaround Time: {sum(turnaround_times) / n:.2f}")
+    print("\n")